@@ -46,10 +46,10 @@ import threading
 import getopt
 import logging
 import time
+import re
 import subprocess
 import os
 import sys
-import plistlib
 import traceback
 import ast
 import json
@@ -86,9 +86,6 @@ import getdevinfo
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
 
-    #Plist hack for Python 3.
-    plistlib.readPlistFromString = plistlib.loads #pylint: disable=no-member
-
 #Define global variables.
 VERSION = "2.0.0"
 RELEASE_DATE = "13/6/2018"
@@ -101,6 +98,12 @@ APPICON = None
 SETTINGS = {}
 DISKINFO = {}
 
+#Matches the loop device kpartx used in its output (eg loop0 in "add map loop0p1 (253:0): ...").
+KPARTX_LOOP_DEVICE = re.compile(r"^add map (loop[0-9]+)p[0-9]+ ", re.MULTILINE)
+
+#Matches any error lines from lsblk (stderr is merged into stdout by start_process).
+LSBLK_ERROR_LINE = re.compile(r"^[^\n]*lsblk:[^\n]*\n?", re.MULTILINE)
+
 def usage():
     """
     Outputs information on cmdline options for the user.
@@ -229,8 +232,8 @@ class GetDiskInformation(threading.Thread):
 
     def get_info(self): #pylint: disable=no-self-use
         """Get disk information as a privileged user"""
-        output = BackendTools.start_process(cmd=sys.executable+" "+RESOURCEPATH
-                                            +"/Tools/run_getdevinfo.py",
+        output = BackendTools.start_process(cmd=[sys.executable,
+                                                 RESOURCEPATH+"/Tools/run_getdevinfo.py"],
                                             return_output=True,
                                             privileged=True)[1]
 
@@ -347,11 +350,12 @@ class CustomTextCtrl(wx.TextCtrl):
                 newlines.append(counter)
 
         #Find the last newline before our insertion point.
-        for newline in newlines:
-            if newlines.index(newline)+1 == len(newlines) or newline == insertion_point:
+        #Track the index as we go, rather than searching the list for it every time.
+        for index, newline in enumerate(newlines):
+            if index+1 == len(newlines) or newline == insertion_point:
                 #This is the last newline in the text, or the newline at our insertion point,
                 #and is therefore the one we want.
-                last_new_line = newline
+                row = index
                 break
 
             elif newline < insertion_point:
@@ -360,15 +364,15 @@ class CustomTextCtrl(wx.TextCtrl):
             else:
                 #When this is triggered, the previous newline (last iteration of the loop)
                 #is the one we want.
-                index = newlines.index(newline)
-                last_new_line = newlines[index-1]
+                row = index-1
                 break
 
+        last_new_line = newlines[row]
+
         #Figure out what column we're in (how many chars after the last newline).
         column = insertion_point - last_new_line
 
-        #Figure out which line we're on (the number of the last newline).
-        row = newlines.index(last_new_line)
+        #Figure out which line we're on (the number of the last newline) - this is row.
 
         return column, row
 
@@ -406,22 +410,10 @@ class CustomTextCtrl(wx.TextCtrl):
         #Get the text up to the current insertion point.
         text = self.GetRange(0, self.GetInsertionPoint())
 
-        #Find the last newline char in the text.
-        newline_numbers = []
-        counter = 0
-
-        for char in text:
-            if char == "\n":
-                newline_numbers.append(counter)
-
-            counter += 1
-
-        if newline_numbers != []:
-            last_newline = newline_numbers[-1]
-
-        else:
-            #Hacky bit to make the new insertion point 0 :)
-            last_newline = -1
+        #Find the last newline char in the text. We don't need the positions of any of
+        #the others, so search backwards for it rather than recording all of them.
+        #If there isn't one, this gives -1, which makes the new insertion point 0 :)
+        last_newline = text.rfind("\n")
 
         #Set the insertion point to just after that newline, unless we're already there,
         #and in that case set the insertion point just after the previous newline.
@@ -1347,9 +1339,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         else:
             cmd = "open"
 
-        subprocess.Popen(cmd
-                         + " https://www.hamishmb.com/html/Docs/ddrescue-gui.php",
-                         shell=True)
+        subprocess.Popen([cmd, "https://www.hamishmb.com/html/Docs/ddrescue-gui.php"])
 
     def on_about(self, event=None): #pylint: disable=unused-argument, no-self-use
         """Show the about box"""
@@ -1434,7 +1424,9 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
             if tuple(sys.version_info)[0:3] == (2, 7, 6):
                 #Use wget to download instead, cos the server doesn't allow SSL.
                 retval, updateinfo = \
-                BackendTools.start_process(cmd="wget https://www.hamishmb.com/files/updateinfo/ddrescue-gui.plist -q -O -", return_output=True)
+                BackendTools.start_process(cmd=["wget", "https://www.hamishmb.com/files/updateinfo/"
+                                                "ddrescue-gui.plist", "-q", "-O", "-"],
+                                           return_output=True)
 
                 if retval != 0:
                     raise requests.exceptions.RequestException()
@@ -1467,7 +1459,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         infotext = ""
         update_recommended = False
 
-        updateinfo = plistlib.readPlistFromString(updateinfo.encode())
+        updateinfo = BackendTools.PLIST_LOADS(updateinfo.encode())
 
         #Determine the latest version for our kind of release.
         if RELEASE_TYPE == "Stable":
@@ -1605,9 +1597,11 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
                                 "disk info), ignoring it...")
                     continue
 
-                if BackendTools.is_mounted(disk) or not BackendTools.is_partition(disk, DISKINFO):
+                is_partition = BackendTools.is_partition(disk, DISKINFO)
+
+                if not is_partition or BackendTools.is_mounted(disk):
                     #The Disk is mounted, or may have partitions that are mounted.
-                    if BackendTools.is_partition(disk, DISKINFO):
+                    if is_partition:
                         #Unmount the disk.
                         logger.debug("MainWindow().on_start(): "+disk+" is a partition. "
                                      "Unmounting "+disk+"...")
@@ -1616,7 +1610,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
                                                "few moments...")
 
                         wx.Yield()
-                        retval = BackendTools.unmount_disk(disk)
+                        retval = BackendTools.unmount_disk(disk, already_mounted=True)
 
                     else:
                         #Unmount any partitions belonging to the device.
@@ -1631,9 +1625,18 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
                         retvals = []
                         retval = 0
 
+                        #Find out which partitions are mounted all at once.
+                        mount_points = BackendTools.get_mount_points(DISKINFO[disk]["Partitions"])
+
                         for partition in DISKINFO[disk]["Partitions"]:
+                            if mount_points[partition] is None:
+                                logger.info("MainWindow().on_start(): "+partition+" is not "
+                                            "mounted...")
+                                continue
+
                             logger.info("MainWindow().on_start(): Unmounting "+partition+"...")
-                            retvals.append(BackendTools.unmount_disk(partition))
+                            retvals.append(BackendTools.unmount_disk(partition,
+                                                                     already_mounted=True))
 
                         #Check the return values, and raise an error if any of them aren't 0.
                         for integer in retvals:
@@ -1824,50 +1827,37 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         """Update the output box"""
         #TODO This should probably be implemented as part of the custom TextCtrl.
 
-        crs = []
-        uols = []
-        char_number = 0
-
-        for char in line:
-            char_number += 1
-
-            if char == "\r":
-                crs.append(char_number)
-
-            elif char == "¬":
-                uols.append(char_number)
-
-        char_number = 0
+        #Carriage returns and "¬" (up one line) end the text so far, and are handled
+        #along with it. Check each character as we go, rather than recording their
+        #positions in separate lists and searching those for every character.
         temp_line = ""
 
         for char in line:
-            char_number += 1
-
-            if char_number not in crs and char_number not in uols:
+            if char not in ("\r", "¬"):
                 temp_line += char
                 if char == "\n":
-                    self.add_line_to_output_box(temp_line, crs, uols, char_number)
+                    self.add_line_to_output_box(temp_line)
                     temp_line = ""
 
             else:
-                self.add_line_to_output_box(temp_line, crs, uols, char_number)
+                self.add_line_to_output_box(temp_line, control_char=char)
                 temp_line = ""
 
-    def add_line_to_output_box(self, line, crs, uols, char_number):
+    def add_line_to_output_box(self, line, control_char=None):
         """
         Adds a new line to the custom output box.
         Also handles calling carriage_return() and
-        up_one_line() when required.
+        up_one_line() when required (control_char is "\\r" or "¬").
         """
 
         #TODO This should probably be implemented as part of the custom TextCtrl.
         insertion_point = self.output_box.GetInsertionPoint()
         self.output_box.Replace(insertion_point, insertion_point+len(line), line)
 
-        if char_number in crs:
+        if control_char == "\r":
             self.output_box.carriage_return()
 
-        elif char_number in uols:
+        elif control_char == "¬":
             self.output_box.up_one_line()
 
     def update_status_bar(self, messeage):
@@ -1884,8 +1874,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         """Abort the recovery"""
         #Ask ddrescue to exit.
         logger.info("MainWindow().on_abort(): Attempting to stop ddrescue...")
-        BackendTools.start_process("killall -INT ddrescue",
-                                   privileged=True)
+        BackendTools.start_process(["killall", "-INT", "ddrescue"], privileged=True)
 
         self.aborted_recovery = True
 
@@ -2198,7 +2187,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
                         else:
                             #Copy it to the specified path, using a one-liner, and don't bother
                             #handling any errors, because this is run as root. FIXME not smart.
-                            BackendTools.start_process(cmd="cp /tmp/ddrescue-gui.log "+_file,
+                            BackendTools.start_process(cmd=["cp", "/tmp/ddrescue-gui.log", _file],
                                                        return_output=False)
 
                             dlg = wx.MessageDialog(self.panel, "Done! DDRescue-GUI will now exit.",
@@ -3039,24 +3028,41 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         wx.CallAfter(self.parent.restart)
         self.Destroy()
 
+    def run_without_blocking(self, function, *args, **kwargs): #pylint: disable=no-self-use
+        """
+        Runs function(*args, **kwargs) in a separate thread, keeping the GUI responsive
+        until it has finished, and returns the result.
+        """
+
+        task = BackendTools.BackgroundTask(function, *args, **kwargs)
+
+        #Wait for the task between handling events, rather than sleeping, so we carry on
+        #as soon as it finishes.
+        while task.is_alive():
+            wx.Yield()
+            task.join(0.04)
+
+        return task.get_result()
+
     def on_mount(self, event=None): #pylint: disable=unused-argument
         """Triggered when mount button is pressed"""
+        #Don't let the user press any buttons until we've finished.
+        self.mount_button.Disable()
+        self.restart_button.Disable()
+        self.quit_button.Disable()
+
         if self.mount_button.GetLabel() == "Mount Image/Disk":
             #Change some stuff if it worked.
             if self.mount_disk():
                 self.top_text.SetLabel("Your recovered data is now mounted at:")
                 self.path_text.SetLabel(self.output_file_mount_point)
                 self.mount_button.SetLabel("Unmount Image/Disk")
-                self.restart_button.Disable()
-                self.quit_button.Disable()
-
-                dlg = wx.MessageDialog(self.panel, "Your output file is now mounted. Leave "
-                                       "DDRescue-GUI open and click unmount when you're finished.",
-                                       "DDRescue-GUI - Information",
-                                       style=wx.OK | wx.ICON_INFORMATION, pos=wx.DefaultPosition)
 
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "Your output file is now mounted. "
+                                                 "Leave DDRescue-GUI open and click unmount when "
+                                                 "you're finished.",
+                                                 "DDRescue-GUI - Information",
+                                                 wx.OK | wx.ICON_INFORMATION)
 
         else:
             #Change some stuff if it worked.
@@ -3064,8 +3070,13 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                 self.top_text.SetLabel("Your recovered data is at:")
                 self.path_text.SetLabel(SETTINGS["OutputFile"])
                 self.mount_button.SetLabel("Mount Image/Disk")
-                self.restart_button.Enable()
-                self.quit_button.Enable()
+
+        self.mount_button.Enable()
+
+        #The user can only restart or quit if the output file isn't mounted.
+        if self.mount_button.GetLabel() == "Mount Image/Disk":
+            self.restart_button.Enable()
+            self.quit_button.Enable()
 
         #Call Layout() on self.panel() to ensure it displays properly.
         self.panel.Layout()
@@ -3081,8 +3092,10 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         wx.Yield()
 
         #Try to umount the output file, if it has been mounted.
-        if self.output_file_mount_point != None:
-            if BackendTools.unmount_disk(self.output_file_mount_point) == 0:
+        mount_point = self.output_file_mount_point
+
+        if mount_point is not None:
+            if self.run_without_blocking(BackendTools.unmount_disk, mount_point) == 0:
                 logger.info("FinishedWindow().unmount_output_file(): Successfully unmounted "
                             "output file...")
 
@@ -3090,13 +3103,11 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                 logger.error("FinishedWindow().unmount_output_file(): Error unmounting output "
                              "file! Warning user...")
 
-                dlg = wx.MessageDialog(self.panel, "It seems your output file is in use. "
-                                       "Please close all applications that could be using it "
-                                       "and try again.", "DDRescue-GUI - Warning",
-                                       style=wx.OK | wx.ICON_INFORMATION)
-
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "It seems your output file is in "
+                                                 "use. Please close all applications that could be "
+                                                 "using it and try again.",
+                                                 "DDRescue-GUI - Warning",
+                                                 wx.OK | wx.ICON_INFORMATION)
                 return False
 
         #Linux: Pull down loops if the OutputFile is a Device.
@@ -3104,21 +3115,22 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         if self.output_file_type == "Device" and LINUX:
             #This won't error on LINUX even if the loop device wasn't set up.
             logger.debug("FinishedWindow().unmount_output_file(): Pulling down loop device...")
-            cmd = "kpartx -d "+SETTINGS["OutputFile"]
+            cmd = ["kpartx", "-d", SETTINGS["OutputFile"]]
 
-        elif LINUX is False and self.output_file_mount_point != None:
+        elif LINUX is False and mount_point is not None:
             #This will error on macOS if the file hasn't been attached, so skip it in that case.
             logger.debug("FinishedWindow().unmount_output_file(): Detaching the device that "
                          "represents the image...")
 
-            cmd = "hdiutil detach "+self.output_file_device_name
+            cmd = ["hdiutil", "detach", self.output_file_device_name]
 
         else:
             #LINUX and partition, or no command needed. Return True.
             logger.debug("FinishedWindow().unmount_output_file(): No further action required.")
             return True
 
-        if BackendTools.start_process(cmd=cmd, return_output=False, privileged=True) == 0:
+        if self.run_without_blocking(BackendTools.start_process, cmd=cmd, return_output=False,
+                                     privileged=True) == 0:
             logger.info("FinishedWindow().unmount_output_file(): Successfully pulled down "
                         "loop device...")
 
@@ -3126,13 +3138,10 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             logger.info("FinishedWindow().unmount_output_file(): Failed to pull down the "
                         "loop device! Warning user...")
 
-            dlg = wx.MessageDialog(self.panel, "Couldn't finish unmounting your output file! "
-                                   "Please close all applications that could be using it and "
-                                   "try again.", "DDRescue-GUI - Warning",
-                                   style=wx.OK | wx.ICON_INFORMATION)
-
-            dlg.ShowModal()
-            dlg.Destroy()
+            BackendTools.show_message_dialog(self.panel, "Couldn't finish unmounting your output "
+                                             "file! Please close all applications that could be "
+                                             "using it and try again.",
+                                             "DDRescue-GUI - Warning", wx.OK | wx.ICON_INFORMATION)
             return False
 
         return True
@@ -3147,18 +3156,18 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         #Determine what type of OutputFile we have (Partition or Device).
         (self.output_file_type, retval, output) = \
-        BackendTools.determine_output_file_type(SETTINGS, disk_info=DISKINFO)
+        self.run_without_blocking(BackendTools.determine_output_file_type, SETTINGS,
+                                  disk_info=DISKINFO)
         #XXX pylint false positive?
 
         #If retval != 0 report to user.
         if retval != 0:
             logger.error("FinishedWindow().mount_disk(): Error! Warning the user...")
-            dlg = wx.MessageDialog(self.panel, "Couldn't mount your output file. The hard disk "
-                                   "image utility failed to run. This could mean your disk image "
-                                   "is damaged, and you need to use a different tool to read it.",
-                                   "DDRescue-GUI - Error!", style=wx.OK | wx.ICON_ERROR)
-            dlg.ShowModal()
-            dlg.Destroy()
+            BackendTools.show_message_dialog(self.panel, "Couldn't mount your output file. The "
+                                             "hard disk image utility failed to run. This could "
+                                             "mean your disk image is damaged, and you need to use "
+                                             "a different tool to read it.",
+                                             "DDRescue-GUI - Error!", wx.OK | wx.ICON_ERROR)
             return False
 
         if self.output_file_type == "Partition":
@@ -3172,26 +3181,26 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #Attempt to mount the disk.
             if LINUX:
                 self.output_file_mount_point = "/mnt"+SETTINGS["InputFile"]
-                retval = BackendTools.mount_disk(partition=SETTINGS["OutputFile"],
-                                                 mount_point=self.output_file_mount_point,
-                                                 options="-r")
+                retval = self.run_without_blocking(BackendTools.mount_disk,
+                                                   partition=SETTINGS["OutputFile"],
+                                                   mount_point=self.output_file_mount_point,
+                                                   options="-r")
 
             else:
-                retval, output = BackendTools.mac_run_hdiutil("attach "+SETTINGS["OutputFile"]
-                                                              +" -readonly -plist")
+                retval, output = self.run_without_blocking(BackendTools.mac_run_hdiutil,
+                                                           ["attach", SETTINGS["OutputFile"],
+                                                            "-readonly", "-plist"])
 
             if retval != 0:
                 logger.error("FinishedWindow().mount_disk(): Error! Warning the user...")
-                dlg = wx.MessageDialog(self.panel, "Couldn't mount your output file. Most "
-                                       "probably, the filesystem is damaged and you'll need to "
-                                       "use another tool to read it from here. It could also be "
-                                       "that your OS doesn't support this filesystem, or that "
-                                       "the recovery is incomplete, as that can sometimes cause "
-                                       "this problem.", "DDRescue-GUI - Error!",
-                                       style=wx.OK | wx.ICON_ERROR)
-
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "Couldn't mount your output file. "
+                                                 "Most probably, the filesystem is damaged and "
+                                                 "you'll need to use another tool to read it from "
+                                                 "here. It could also be that your OS doesn't "
+                                                 "support this filesystem, or that the recovery is "
+                                                 "incomplete, as that can sometimes cause this "
+                                                 "problem.",
+                                                 "DDRescue-GUI - Error!", wx.OK | wx.ICON_ERROR)
                 return False
 
             if LINUX:
@@ -3212,12 +3221,9 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                                  "warning user...")
 
                     self.unmount_output_file()
-                    dlg = wx.MessageDialog(self.panel, "FIXME: Couldn't parse output of hdiutil "
-                                           "mount due to UnicodeDecodeError.",
-                                           "DDRescue-GUI - Error", style=wx.OK | wx.ICON_ERROR)
-
-                    dlg.ShowModal()
-                    dlg.Destroy()
+                    BackendTools.show_message_dialog(self.panel, "FIXME: Couldn't parse output of "
+                                                     "hdiutil mount due to UnicodeDecodeError.",
+                                                     "DDRescue-GUI - Error", wx.OK | wx.ICON_ERROR)
                     return False
 
                 logger.info("FinishedWindow().mount_disk(): Success! Waiting for user to finish "
@@ -3231,48 +3237,90 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                          "list of contained partitions...")
 
             if LINUX:
+                #Check if out version of lsblk has the -J option, for JSON output.
+                #This check is here because Ubuntu 14.04 doesn't have this capabiity.
+                #It doesn't depend on the loop devices, and needs no privileges, so run
+                #it while we set those up. The answer can't change, so only check once.
+                if BackendTools.LSBLK_JSON_SUPPORTED is None:
+                    lsblk_help = BackendTools.BackgroundProcess(cmd=["lsblk", "-h"],
+                                                                return_output=True)
+
+                else:
+                    lsblk_help = None
+
                 #Create loop devices for all contained partitions.
                 logger.info("FinishedWindow().mount_disk(): Creating loop device...")
-                BackendTools.start_process(cmd="kpartx -a "
-                                           + SETTINGS["OutputFile"],
-                                           return_output=False, privileged=True)
+                kpartx_output = self.run_without_blocking(BackendTools.start_process,
+                                                          cmd=["kpartx", "-av",
+                                                               SETTINGS["OutputFile"]],
+                                                          return_output=True,
+                                                          privileged=True)[1]
 
                 #Do a part probe to make sure the loop device has been searched.
-                BackendTools.start_process(cmd="partprobe", return_output=False,
-                                           privileged=True)
+                #Only probe the loop device kpartx used (from eg "add map loop0p1 ..."),
+                #rather than every disk on the system, as that can take a long time.
+                loop_devices = set("/dev/"+name
+                                   for name in KPARTX_LOOP_DEVICE.findall(kpartx_output))
+
+                #We can only tell which partitions belong to the output file if kpartx used
+                #a single loop device for it.
+                if len(loop_devices) > 1:
+                    logger.error("FinishedWindow().mount_disk(): kpartx set up more than one "
+                                 "loop device ("+', '.join(sorted(loop_devices))+") for the "
+                                 "output file! Cleaning up and warning the user...")
 
-                #Check if out version of lsblk has the -J option, for JSON output.
-                #This check is here because Ubuntu 14.04 doesn't have this capabiity.
-                LSBLK_JSON_SUPPORTED = \
-                ("-J, --json" in BackendTools.start_process(cmd="lsblk -h",
-                                                            return_output=True,
-                                                            privileged=True)[1])
+                    self.unmount_output_file()
+                    BackendTools.show_message_dialog(self.panel, "Couldn't mount your output "
+                                                     "file, because more than one loop device "
+                                                     "was set up for it. Please make sure it "
+                                                     "isn't already in use, and try again.",
+                                                     "DDRescue-GUI - Error!",
+                                                     wx.OK | wx.ICON_ERROR)
+                    return False
 
-                if LSBLK_JSON_SUPPORTED:
+                self.run_without_blocking(BackendTools.start_process,
+                                          cmd=["partprobe"]+sorted(loop_devices),
+                                          return_output=False, privileged=True)
 
-                    #We can do things a more modern, more reliable way.
-                    #Get some Disk information.
-                    lsblk_output = BackendTools.start_process(cmd="lsblk -J -o NAME,FSTYPE,SIZE",
-                                                              return_output=True,
-                                                              privileged=True)[1].split("\n")
+                #Use the name of the loop device kpartx just set up. kpartx -l (which we
+                #got output from earlier) used a temporary one that may have been different.
+                if loop_devices:
+                    loop_device = list(loop_devices)[0].replace("/dev/", "")
+
+                else:
+                    loop_device = output[0].split()[0].rsplit("p", 1)[0]
+
+                if lsblk_help is not None:
+                    BackendTools.LSBLK_JSON_SUPPORTED = \
+                    ("-J, --json" in lsblk_help.get_result()[1])
 
-                    #Remove any errors from lsblk in the output.
-                    cleaned_lsblk_output = []
+                LSBLK_JSON_SUPPORTED = BackendTools.LSBLK_JSON_SUPPORTED
 
-                    for line in lsblk_output:
-                        if "lsblk:" not in line:
-                            cleaned_lsblk_output.append(line)
+                #Only list the loop device(s) (and their partitions), rather than every
+                #device on the system, as they're all we're interested in.
+                if LSBLK_JSON_SUPPORTED:
 
-                    lsblk_output = '\n'.join(cleaned_lsblk_output)
+                    #We can do things a more modern, more reliable way.
+                    #Get some Disk information.
+                    lsblk_output = self.run_without_blocking(BackendTools.start_process,
+                                                             cmd=["lsblk", "-J", "-o",
+                                                                  "NAME,FSTYPE,SIZE"]
+                                                             + sorted(loop_devices),
+                                                             return_output=True,
+                                                             privileged=True)[1]
 
-                    #Parse into a dictionary w/ json. TODO Error checking.
-                    lsblk_output = json.loads(lsblk_output)
+                    #Remove any errors from lsblk in the output, and parse into a dictionary
+                    #w/ json. TODO Error checking.
+                    lsblk_output = json.loads(LSBLK_ERROR_LINE.sub("", lsblk_output))
 
                 else:
                     #Do things the older, less reliable way from previous versions of ddrescue-gui.
-                    lsblk_output = BackendTools.start_process(cmd="lsblk -r -o NAME,FSTYPE,SIZE",
-                                                              return_output=True,
-                                                              privileged=True)[1].split('\n')
+                    lsblk_output = self.run_without_blocking(BackendTools.start_process,
+                                                             cmd=["lsblk", "-r", "-o",
+                                                                  "NAME,FSTYPE,SIZE"]
+                                                             + sorted(loop_devices),
+                                                             return_output=True,
+                                                             privileged=True)[1].splitlines()
 
             else:
                 hdiutil_imageinfo_output = output
@@ -3285,21 +3333,17 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #Create a nice list of Partitions for the user.
             choices = []
 
-            #Linux: Get the name of the loop device and construct the choices.
+            #Linux: Construct the choices.
             if LINUX and LSBLK_JSON_SUPPORTED:
-                loop_device = "loop"+output[0].split()[0][4:-2]
+                #Index the devices by name, so we can look up our loop device directly.
+                devices = dict((device["name"], device) for device in lsblk_output["blockdevices"])
 
                 #Get the info related to this partition.
-                for device in lsblk_output["blockdevices"]:
-                    if device["name"] == loop_device:
-                        for disk in device["children"]:
-                            #Add stuff, trying to keep it human-readable.
-                            if disk["fstype"] is None:
-                                disk["fstype"] = "None"
-
-                            choices.append("Partition "+disk["name"]
-                                           + ", Filesystem: "+disk["fstype"]
-                                           + ", Size: "+disk["size"])
+                for disk in devices.get(loop_device, {}).get("children", []):
+                    #Add stuff, trying to keep it human-readable.
+                    choices.append("Partition "+disk["name"]
+                                   + ", Filesystem: "+(disk["fstype"] or "None")
+                                   + ", Size: "+disk["size"])
 
             #macOS and Ubuntu 14.04.
             else:
@@ -3312,12 +3356,15 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                     if LINUX:
                         #Older stuff for Ubuntu 14.04 support.
                         #Get the info related to this partition.
+                        partition_name = loop_device+"p"+partition.split()[0].split("p")[-1]
+
                         for line in lsblk_output:
-                            if partition.split()[0] in line:
+                            if partition_name in line:
                                 #Add stuff, trying to keep it human-readable.
-                                choices.append("Partition "+partition.split()[0].split("p")[-1]
-                                               + ", Filesystem: "+line.split()[-2]
-                                               + ", Size: "+line.split()[-1])
+                                split_line = line.split()
+                                choices.append("Partition "+partition_name.split("p")[-1]
+                                               + ", Filesystem: "+split_line[-2]
+                                               + ", Size: "+split_line[-1])
 
                     else:
                         choices.append("Partition "+unicode(partition["partition-number"])
@@ -3333,20 +3380,20 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                              "recovered is partially corrupted, and you need to use "
                              "another tool to extract meaningful data from it.")
 
-                dlg = wx.MessageDialog(self.panel, "Couldn't find any partitions to mount! "
-                                       "This could indicate a bug in the GUI, or a problem "
-                                       "with your recovered image. It's possible the data you "
-                                       "recovered is partially corrupted, and you need to use "
-                                       "another tool to extract meaningful data from it.",
-                                       "DDRescue-GUI - Error", style=wx.OK | wx.ICON_ERROR)
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "Couldn't find any partitions to "
+                                                 "mount! This could indicate a bug in the GUI, or "
+                                                 "a problem with your recovered image. It's "
+                                                 "possible the data you recovered is partially "
+                                                 "corrupted, and you need to use another tool to "
+                                                 "extract meaningful data from it.",
+                                                 "DDRescue-GUI - Error", wx.OK | wx.ICON_ERROR)
 
                 return False
 
 
-            #Sort the list alphabetically (it can sometimes be out of order).
-            choices.sort()
+            #Sort the list (it can sometimes be out of order). Sort numbers by value, so that
+            #eg partition 10 comes after partition 2.
+            choices.sort(key=BackendTools.natural_sort_key)
 
             #Ask the user which partition to mount.
             logger.debug("FinishedWindow().mount_disk(): Asking user which partition to mount...")
@@ -3367,7 +3414,7 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
             #Fix for Ubuntu 14.04.
             if LINUX and not LSBLK_JSON_SUPPORTED:
-                selected_partition = "loop"+output[0].split()[0][4:-2]+"p"+selected_partition
+                selected_partition = loop_device+"p"+selected_partition
 
             #Notify user of mount attempt.
             logger.info("FinishedWindow().mount_disk(): Mounting partition "
@@ -3383,29 +3430,30 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
                 self.output_file_mount_point = "/mnt"+partition_to_mount
 
                 #Attempt to mount the disk.
-                retval = BackendTools.mount_disk(partition_to_mount, self.output_file_mount_point,
-                                                 options="-r")
+                retval = self.run_without_blocking(BackendTools.mount_disk, partition_to_mount,
+                                                   self.output_file_mount_point, options="-r")
 
             else:
                 #Attempt to mount the disk (this mounts all partitions inside),
                 #and parse the resulting plist.
                 (retval, mount_output) = \
-                BackendTools.mac_run_hdiutil("attach "+SETTINGS["OutputFile"]+" -readonly -plist")
+                self.run_without_blocking(BackendTools.mac_run_hdiutil,
+                                          ["attach", SETTINGS["OutputFile"], "-readonly",
+                                           "-plist"])
 
-                mount_output = plistlib.readPlistFromString(mount_output.encode())
+                #We only need the list of disks that were attached.
+                mount_output = list(BackendTools.mac_get_system_entities(mount_output))
 
             #Handle it if the mount attempt failed.
             if retval != 0:
                 logger.error("FinishedWindow().mount_disk(): Error! Warning the user...")
-                dlg = wx.MessageDialog(self.panel, "Couldn't mount your output file. Most "
-                                       "probably, the filesystem is damaged or unsupported "
-                                       "and you'll need to use another tool to read it from "
-                                       "here. It could also be that your recovery is incomplete, "
-                                       "as that can sometimes cause this problem.",
-                                       "DDRescue-GUI - Error!", style=wx.OK | wx.ICON_ERROR)
-
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "Couldn't mount your output file. "
+                                                 "Most probably, the filesystem is damaged or "
+                                                 "unsupported and you'll need to use another tool "
+                                                 "to read it from here. It could also be that your "
+                                                 "recovery is incomplete, as that can sometimes "
+                                                 "cause this problem.",
+                                                 "DDRescue-GUI - Error!", wx.OK | wx.ICON_ERROR)
                 return False
 
             elif LINUX and retval == 0:
@@ -3418,8 +3466,8 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #On macOS, we aren't finished yet.
             #We need to ge the device name for the partition we wanted to mount, and check it
             #was actually mounted by the command earlier.
-                #Get the list of disks mounted.
-            disks = mount_output["system-entities"]
+            #Get the list of disks mounted.
+            disks = mount_output
 
             #Get the device name given to the output file.
             #Set this so if we don't find our partition, we can still unmount the image
@@ -3428,30 +3476,29 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
             success = False
 
-            #Check that the filesystem the user wanted is among those that have been mounted.
-            for partition in disks:
-                disk = partition["dev-entry"]
+            #Index the disks by partition number (eg 2 for /dev/disk3s2), so we can look up
+            #the one the user wanted directly.
+            partitions = dict((partition["dev-entry"].rsplit("s", 1)[-1], partition)
+                              for partition in disks)
 
-                if disk.split("s")[-1] == selected_partition:
-                    #Check if the partition we want was mounted (hdiutil mounts all mountable
-                    #partitions in the image automatically).
-                    if "mount-point" in partition:
-                        self.output_file_mount_point = partition["mount-point"]
-                        success = True
-                        break
+            partition = partitions.get(selected_partition, {})
+
+            #Check that the filesystem the user wanted is among those that have been mounted
+            #(hdiutil mounts all mountable partitions in the image automatically).
+            if "mount-point" in partition:
+                self.output_file_mount_point = partition["mount-point"]
+                success = True
 
             if not success:
                 logger.info("FinishedWindow().mount_disk(): Unsupported or damaged filesystem. "
                             "Warning user and cleaning up...")
 
                 self.unmount_output_file()
-                dlg = wx.MessageDialog(self.panel, "That filesystem is either not supported by "
-                                       "macOS, or it is damaged (perhaps because the recovery is "
-                                       "incomplete). Please try again and select a different "
-                                       "partition.", "DDRescue-GUI - Error", wx.OK | wx.ICON_ERROR)
-
-                dlg.ShowModal()
-                dlg.Destroy()
+                BackendTools.show_message_dialog(self.panel, "That filesystem is either not "
+                                                 "supported by macOS, or it is damaged (perhaps "
+                                                 "because the recovery is incomplete). Please try "
+                                                 "again and select a different partition.",
+                                                 "DDRescue-GUI - Error", wx.OK | wx.ICON_ERROR)
                 return False
 
             logger.info("FinishedWindow().mount_disk(): Success! Waiting for user to finish with "
@@ -3539,6 +3586,9 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
         self.old_status = ""
         self.got_initial_status = False
         self.unit_list = ['null', 'B', 'k', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y']
+
+        #Look up unit numbers with a dictionary rather than searching unit_list every time.
+        self.unit_numbers = dict((unit, number) for number, unit in enumerate(self.unit_list))
         self.input_pos = "0 B"
         self.disk_capacity = "An unknown amount of"
 
@@ -3570,6 +3620,9 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
         for function in suitable_functions:
             vars(self)[function.__name__] = function
 
+        #Work out the minor version once, rather than for every line of output.
+        self.ddrescue_minor_version = int(SETTINGS["DDRescueVersion"].split(".")[1])
+
         #Prepare to start ddrescue.
         logger.debug("MainBackendThread(): Preparing to start ddrescue...")
         options_list = [SETTINGS["DirectAccess"], SETTINGS["OverwriteOutputFile"],
@@ -3612,41 +3665,46 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
 
         cmd = subprocess.Popen(exec_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         line = ""
-        char = " " #Set this so the while loop exeutes at least once.
 
         #Give ddrescue plenty of time to start.
         time.sleep(2)
 
-        #Grab information from ddrescue. (After ddrescue exits, attempt to keep reading chars until
-        #the last attempt gave an empty string)
-        while cmd.poll() is None or char != "":
-            char = cmd.stdout.read(1).decode("utf-8")
-            line += char
+        #Grab information from ddrescue, a whole line at a time, until it exits and we've
+        #read everything it wrote. Only newlines end a line - any carriage returns are left
+        #in, for the output box.
+        for raw_line in iter(cmd.stdout.readline, b""):
+            line = raw_line.decode("utf-8", errors="ignore")
 
-            #If this is the end of the line, process it, and send the results to the GUI thread.
-            if char == "\n":
-                tidy_line = line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
+            if not line.endswith("\n"):
+                #The last line, without a newline. Handled below.
+                break
+
+            #This is the end of the line, so process it, and send the results to the GUI thread.
+            tidy_line = line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
+
+            if tidy_line != "":
+                try:
+                    self.process_line(tidy_line)
 
-                if tidy_line != "":
-                    try:
-                        self.process_line(tidy_line)
+                except Exception:
+                    #Handle unexpected errors. Can happen once in normal operation on
+                    #ddrescue v1.22+. TODO make smarter, don't fill log with these.
+                    #TODO suppress 1st error if on new versions.
+                    logger.warning("MainBackendThread(): Unexpected error parsing ddrescue's "
+                                   "output! Can happen once on newer versions of ddrescue "
+                                   "(1.22+) in normal operation. Are you running a "
+                                   "newer/older version of ddrescue than we support?")
 
-                    except Exception:
-                        #Handle unexpected errors. Can happen once in normal operation on
-                        #ddrescue v1.22+. TODO make smarter, don't fill log with these.
-                        #TODO suppress 1st error if on new versions.
-                        logger.warning("MainBackendThread(): Unexpected error parsing ddrescue's "
-                                       "output! Can happen once on newer versions of ddrescue "
-                                       "(1.22+) in normal operation. Are you running a "
-                                       "newer/older version of ddrescue than we support?")
+            #The ¬ is being used to denote where the output box should go up
+            #one line before continuing to write. A bit like a carriage return
+            #but the other way around.
+            wx.CallAfter(self.parent.update_output_box, line.replace("\x1b[A", "¬"))
 
-                #The ¬ is being used to denote where the output box should go up
-                #one line before continuing to write. A bit like a carriage return
-                #but the other way around.
-                wx.CallAfter(self.parent.update_output_box, line.replace("\x1b[A", "¬"))
+            #Reset line.
+            line = ""
 
-                #Reset line.
-                line = ""
+        #Wait for ddrescue to exit, so we have its return code.
+        cmd.wait()
 
         #Parse any remaining lines afterwards.
         if line != "":
@@ -3745,7 +3803,7 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
             #Start time elapsed thread.
             ElapsedTimeThread(self.parent)
 
-        elif split_line[0] == "ipos:" and int(SETTINGS["DDRescueVersion"].split(".")[1]) < 21:
+        elif split_line[0] == "ipos:" and self.ddrescue_minor_version < 21:
             #Versions 1.14 - 1.20.
 
             #pylint: disable=no-member
@@ -3760,7 +3818,7 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
         elif split_line[0] == "opos:":
             #Versions 1.14 - 1.20 & 1.21 - 1.23.
 
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
+            if self.ddrescue_minor_version >= 21:
                 #Get average read rate (ddrescue 1.21 - 1.23).
                 (self.output_pos, self.average_read_rate, self.average_read_rate_unit) = \
                 self.get_outputpos_average_read_rate(split_line) #pylint: disable=no-member
@@ -3785,13 +3843,13 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
 
             wx.CallAfter(self.parent.update_error_size, self.error_size)
 
-        elif split_line[0] in ("time", "percent"): #Time since last read (ddrescue v1.20 - 1.23).
+        elif split_line[0] in {"time", "percent"}: #Time since last read (ddrescue v1.20 - 1.23).
             #pylint: disable=no-member
             self.time_since_last_read = self.get_time_since_last_read(split_line)
 
             wx.CallAfter(self.parent.update_time_since_last_read, self.time_since_last_read)
 
-        elif split_line[0] == "rescued:" and int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
+        elif split_line[0] == "rescued:" and self.ddrescue_minor_version >= 21:
             #Recovered data and number of errors (ddrescue 1.21 - 1.23).
 
             #Don't crash if we're reading the initial status from the logfile.
@@ -3819,10 +3877,10 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
             except AttributeError:
                 pass
 
-        elif ("rescued:" in line and split_line[0] not in ("rescued:", "pct")) or "ipos:" in line:
+        elif ("rescued:" in line and split_line[0] not in {"rescued:", "pct"}) or "ipos:" in line:
             #Versions 1.14 - 1.20 & 1.21 - 1.23
 
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
+            if self.ddrescue_minor_version >= 21:
                 status, info = line.split("ipos:")
 
             else:
@@ -3835,7 +3893,7 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
 
             split_line = info.split()
 
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
+            if self.ddrescue_minor_version >= 21:
                 #pylint: disable=no-member
                 self.current_read_rate, self.input_pos = self.get_current_rate_inputpos(split_line)
 
@@ -3875,8 +3933,8 @@ class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attrib
     def change_units(self, number_to_change, current_unit, required_unit):
         """Convert data so it uses the correct unit of measurement"""
         #Prepare for the change.
-        old_unit_number = self.unit_list.index(current_unit[0])
-        required_unit_number = self.unit_list.index(required_unit[0])
+        old_unit_number = self.unit_numbers[current_unit[0]]
+        required_unit_number = self.unit_numbers[required_unit[0]]
         change_in_unit_number = required_unit_number - old_unit_number
         power = -change_in_unit_number * 3
 
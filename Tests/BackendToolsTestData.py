@@ -66,3 +66,159 @@ def return_fake_filenames():
     dictionary["/home/hamish/Desktop/img2.img"]["Result"] = ["...Desktop/img.img", "...esktop/img2.img", "...Desktop/img.i~2"]
 
     return dictionary
+
+def return_fake_disk_headers():
+    """Returns the starts of some fake disk images to test the may_have_partition_table function against."""
+
+    def make_header(*fields):
+        """Returns a 2048-byte header, with the given (offset, bytes) fields filled in."""
+        header = bytearray(2048)
+
+        for offset, data in fields:
+            header[offset:offset+len(data)] = data
+
+        return bytes(header)
+
+    boot_signature = (510, b"\x55\xaa")
+
+    dictionary = {}
+    dictionary["MBR"] = {}
+    dictionary["MBR"]["Header"] = make_header((446, b"\x80\x20\x21\x00\x83\xfe\xff\xff\x00\x08\x00\x00\x00\x00\x10\x00"),
+                                              boot_signature)
+    dictionary["MBR"]["Result"] = True
+    dictionary["MBR with bad status byte"] = {}
+    dictionary["MBR with bad status byte"]["Header"] = make_header((446, b"\x7f\x20\x21\x00\x83\xfe\xff\xff\x00\x08\x00\x00\x00\x00\x10\x00"),
+                                                                   boot_signature)
+    dictionary["MBR with bad status byte"]["Result"] = True
+    dictionary["MBR with all-zero entries"] = {}
+    dictionary["MBR with all-zero entries"]["Header"] = make_header(boot_signature)
+    dictionary["MBR with all-zero entries"]["Result"] = True
+    dictionary["FAT boot sector"] = {}
+    dictionary["FAT boot sector"]["Header"] = make_header((0, b"\xeb\x3c\x90MSDOS5.0\x00\x02\x08"),
+                                                          (446, b"\x0e\x1f\xbe\x5b\x7c\xac\x22\xc0\x74\x0b\x56\xb4\x0e\xbb\x07\x00"),
+                                                          boot_signature)
+    dictionary["FAT boot sector"]["Result"] = True
+    dictionary["GPT"] = {}
+    dictionary["GPT"]["Header"] = make_header((446, b"\x00\x00\x02\x00\xee\xff\xff\xff\x01\x00\x00\x00\xff\xff\x0f\x00"),
+                                              boot_signature, (512, b"EFI PART"))
+    dictionary["GPT"]["Result"] = True
+    dictionary["Apple Partition Map"] = {}
+    dictionary["Apple Partition Map"]["Header"] = make_header((0, b"ER\x02\x00"), (512, b"PM\x00\x00"))
+    dictionary["Apple Partition Map"]["Result"] = True
+    dictionary["Sun disklabel"] = {}
+    dictionary["Sun disklabel"]["Header"] = make_header((508, b"\xda\xbe"), (1080, b"\x53\xef"))
+    dictionary["Sun disklabel"]["Result"] = True
+    dictionary["BSD disklabel"] = {}
+    dictionary["BSD disklabel"]["Header"] = make_header((512, b"\x57\x45\x56\x82"), (1080, b"\x53\xef"))
+    dictionary["BSD disklabel"]["Result"] = True
+    dictionary["SGI disklabel"] = {}
+    dictionary["SGI disklabel"]["Header"] = make_header((0, b"\x0b\xe5\xa9\x41"))
+    dictionary["SGI disklabel"]["Result"] = True
+    dictionary["ext4 with boot signature"] = {}
+    dictionary["ext4 with boot signature"]["Header"] = make_header(boot_signature, (1080, b"\x53\xef"))
+    dictionary["ext4 with boot signature"]["Result"] = True
+    dictionary["Unknown"] = {}
+    dictionary["Unknown"]["Header"] = make_header()
+    dictionary["Unknown"]["Result"] = True
+    dictionary["ext4"] = {}
+    dictionary["ext4"]["Header"] = make_header((1080, b"\x53\xef"))
+    dictionary["ext4"]["Result"] = False
+    dictionary["XFS"] = {}
+    dictionary["XFS"]["Header"] = make_header((0, b"XFSB\x00\x00\x10\x00"))
+    dictionary["XFS"]["Result"] = False
+    dictionary["HFS+"] = {}
+    dictionary["HFS+"]["Header"] = make_header((1024, b"H+\x00\x04"))
+    dictionary["HFS+"]["Result"] = False
+
+    return dictionary
+
+def return_fake_mountinfo():
+    """Returns some fake /proc/self/mountinfo contents to test the _parse_mountinfo function against."""
+
+    return """22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw,errors=remount-ro
+23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime shared:12 - proc proc rw
+24 22 8:2 / /media/hamish/My\\040Disk rw,nosuid,nodev,relatime shared:30 master:2 - ext4 /dev/sdb1 rw
+25 22 8:1 /home /mnt/bind rw,relatime shared:1 - ext4 /dev/sda1 rw,errors=remount-ro
+26 22 7:0 / /tmp/ddrescueguimtpt ro,relatime - vfat /dev/mapper/loop0p1 ro
+this line is not valid
+"""
+
+def return_fake_mount_output():
+    """Returns some fake output from "mount" to test the _parse_mount_text function against."""
+
+    return """/dev/disk1s1 on / (apfs, local, journaled)
+devfs on /dev (devfs, local, nobrowse)
+/dev/disk2s1 on /Volumes/USB (msdos, local, nodev, nosuid, noowners)
+/dev/disk1s1 on /private/var/vm (apfs, local, noexec, journaled, noatime, nobrowse)
+"""
+
+def return_fake_hdiutil_attach_output():
+    """Returns some fake output from "hdiutil attach -plist" to test the mac_get_system_entities function against."""
+
+    return """hdiutil: attach: WARNING: ignoring IDME options (obsolete)
+<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+	<key>system-entities</key>
+	<array>
+		<dict>
+			<key>content-hint</key>
+			<string>GUID_partition_scheme</string>
+			<key>dev-entry</key>
+			<string>/dev/disk3</string>
+			<key>potentially-mountable</key>
+			<false/>
+			<key>unmapped-content-hint</key>
+			<string>GUID_partition_scheme</string>
+		</dict>
+		<dict>
+			<key>content-hint</key>
+			<string>EFI</string>
+			<key>dev-entry</key>
+			<string>/dev/disk3s1</string>
+			<key>potentially-mountable</key>
+			<true/>
+		</dict>
+		<dict>
+			<key>content-hint</key>
+			<string>Apple_HFS</string>
+			<key>dev-entry</key>
+			<string>/dev/disk3s2</string>
+			<key>mount-point</key>
+			<string>/Volumes/My Disk</string>
+			<key>potentially-mountable</key>
+			<true/>
+			<key>volume-kind</key>
+			<string>hfs</string>
+		</dict>
+	</array>
+	<key>other-entities</key>
+	<array>
+		<dict>
+			<key>dev-entry</key>
+			<string>/dev/disk9</string>
+		</dict>
+	</array>
+</dict>
+</plist>
+Some trailing text from hdiutil.
+"""
+
+def return_fake_hdiutil_output_without_entities():
+    """Returns some fake plist output from hdiutil, with no "system-entities" key."""
+
+    return """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+	<key>images</key>
+	<array>
+		<dict>
+			<key>image-path</key>
+			<string>/Users/hamish/Desktop/img.img</string>
+		</dict>
+	</array>
+</dict>
+</plist>
+"""
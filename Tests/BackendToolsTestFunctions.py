@@ -29,7 +29,8 @@ from __future__ import unicode_literals
 
 #Do other imports.
 import subprocess
-import time
+import shlex
+import errno
 import os
 import sys
 import wx
@@ -50,19 +51,19 @@ elif "wxMac" in wx.PlatformInfo:
     PARTED_MAGIC = False
 
 def start_process(cmd, return_output=False):
-    """Start a given process, and return output and return value if needed"""
-    runcmd = subprocess.Popen("LC_ALL=C "+cmd, stdout=subprocess.PIPE,
-                              stderr=subprocess.STDOUT, shell=True)
+    """
+    Start a given process (cmd is a list of arguments), and return output and
+    return value if needed
+    """
+    runcmd = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              env=dict(os.environ, LC_ALL="C"))
 
-    while runcmd.poll() is None:
-        time.sleep(0.25)
+    #Block until the process exits, rather than polling for it.
+    stdout_bytes = runcmd.communicate()[0]
 
-    #Save runcmd.stdout.readlines, and runcmd.returncode, as they tend to reset fairly quickly.
+    #Save the output, and runcmd.returncode, as they tend to reset fairly quickly.
     #Handle unicode properly.
-    output = []
-
-    for line in runcmd.stdout.readlines():
-        output.append(line.decode("UTF-8", errors="ignore"))
+    output = stdout_bytes.decode("UTF-8", errors="ignore")
 
     retval = int(runcmd.returncode)
 
@@ -73,7 +74,7 @@ def start_process(cmd, return_output=False):
 
     else:
         #Return the return code, as well as the output.
-        return retval, ''.join(output)
+        return retval, output
 
 def is_mounted(partition, mount_point=None):
     """Checks if the given partition is mounted.
@@ -85,7 +86,7 @@ def is_mounted(partition, mount_point=None):
     """
 
     if mount_point is None:
-        mount_info = start_process("mount", return_output=True)[1]
+        mount_info = start_process(["mount"], return_output=True)[1]
 
         mounted = False
 
@@ -94,11 +95,12 @@ def is_mounted(partition, mount_point=None):
             partition = partition.replace("/tmp", "/private/tmp")
 
         #LINUX fix: Accept any mount_point when called with just one argument.
-        for line in mount_info.split("\n"):
-            if len(line) != 0:
-                if line.split()[0] == partition or line.split()[2] == partition:
-                    mounted = True
-                    break
+        for line in mount_info.splitlines():
+            split_line = line.split()
+
+            if split_line and (split_line[0] == partition or split_line[2] == partition):
+                mounted = True
+                break
 
     else:
         #Check where it's mounted to.
@@ -119,7 +121,7 @@ def get_mount_point(partition):
     Otherwise, return None
     """
 
-    mount_info = start_process("mount", return_output=True)[1]
+    mount_info = start_process(["mount"], return_output=True)[1]
     mount_point = None
 
     for line in mount_info.split("\n"):
@@ -141,7 +143,7 @@ def mount_disk(partition, mount_point, options=""):
     The default value for options is an empty string.
     """
 
-    mount_info = start_process("mount", return_output=True)[1]
+    mount_info = start_process(["mount"], return_output=True)[1]
 
     #There is a partition mounted here. Check if it's ours.
     if mount_point == get_mount_point(partition):
@@ -153,17 +155,22 @@ def mount_disk(partition, mount_point, options=""):
         if unmount_disk(mount_point) != 0:
             return False
 
-    #Create the dir if needed.
-    if os.path.isdir(mount_point) is False:
+    #Create the dir if needed. Just try, rather than checking first.
+    try:
         os.makedirs(mount_point)
 
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
     #Mount the device to the mount point.
     #Use diskutil on OS X.
     if LINUX:
-        retval = start_process("mount "+options+" "+partition+" "+mount_point)
+        retval = start_process(["mount"]+shlex.split(options)+[partition, mount_point])
 
     else:
-        retval = start_process("diskutil mount "+options+" "+partition+" -mount_point "+mount_point)
+        retval = start_process(["diskutil", "mount"]+shlex.split(options)
+                               +["-mountPoint", mount_point, partition])
 
     return retval
 
@@ -179,10 +186,10 @@ def unmount_disk(disk):
         #The disk is mounted.
         #Unmount it.
         if LINUX:
-            retval = start_process(cmd="umount "+disk, return_output=False)
+            retval = start_process(cmd=["umount", disk], return_output=False)
 
         else:
-            retval = start_process(cmd="diskutil umount "+disk, return_output=False)
+            retval = start_process(cmd=["diskutil", "umount", disk], return_output=False)
 
     #Return the return value
     return retval
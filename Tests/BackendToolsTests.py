@@ -29,6 +29,7 @@ from __future__ import unicode_literals
 #Import modules
 import unittest
 import os
+import tempfile
 import sys
 import logging
 import wx
@@ -42,6 +43,10 @@ from Tools import tools as BackendTools #pylint: disable=import-error
 #Silence tools logger.
 BackendTools.logger.setLevel(logging.CRITICAL)
 
+#Don't reuse cached "mount" output - these tests mount and unmount things behind
+#BackendTools' back.
+BackendTools.MOUNT_CACHE_MAX_AGE = 0
+
 #Import test data and functions.
 from . import BackendToolsTestData as Data
 from . import BackendToolsTestFunctions as Functions
@@ -99,6 +104,64 @@ class TestCreateUniqueKey(unittest.TestCase):
             self.assertTrue(key in self.filenames[_file]["Result"])
             self.keys_dictionary[key] = ""
 
+class TestNaturalSortKey(unittest.TestCase):
+    """Tests for natural_sort_key()"""
+
+    def test_natural_sort_key1(self):
+        """Test #1: Sort strings with numbers in them."""
+        self.assertEqual(sorted(["Partition 10, Size: 1G", "Partition 2, Size: 10G",
+                                 "Partition 1, Size: 2G"], key=BackendTools.natural_sort_key),
+                         ["Partition 1, Size: 2G", "Partition 2, Size: 10G",
+                          "Partition 10, Size: 1G"])
+
+        self.assertEqual(sorted(["loop10p1", "loop9p2", "loop9p10"],
+                                key=BackendTools.natural_sort_key),
+                         ["loop9p2", "loop9p10", "loop10p1"])
+
+    def test_natural_sort_key2(self):
+        """Test #2: Sort strings where one is a prefix of another."""
+        self.assertEqual(sorted(["Partition 1, Size: 2G", "Partition 1", "Partition"],
+                                key=BackendTools.natural_sort_key),
+                         ["Partition", "Partition 1", "Partition 1, Size: 2G"])
+
+    def test_natural_sort_key3(self):
+        """Test #3: Sort strings with and without numbers in them."""
+        self.assertEqual(sorted(["sdb", "sda", "2", "sda10", "sda2", "10"],
+                                key=BackendTools.natural_sort_key),
+                         ["2", "10", "sda", "sda2", "sda10", "sdb"])
+
+class TestMayHavePartitionTable(unittest.TestCase):
+    """Tests for may_have_partition_table()"""
+
+    def setUp(self):
+        self.headers = Data.return_fake_disk_headers()
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+        del self.headers
+        del self.path
+
+    def test_may_have_partition_table1(self):
+        """Test #1: Check the starts of some fake disk images."""
+        for header in self.headers:
+            with open(self.path, "wb") as image:
+                image.write(self.headers[header]["Header"])
+
+            self.assertEqual(BackendTools.may_have_partition_table(self.path),
+                             self.headers[header]["Result"], header)
+
+    def test_may_have_partition_table2(self):
+        """Test #2: Check an image that can't be read (kpartx should be used)."""
+        os.remove(self.path)
+
+        self.assertTrue(BackendTools.may_have_partition_table(self.path))
+
+        #Recreate it for tearDown().
+        open(self.path, "wb").close()
+
 class TestSendNotification(unittest.TestCase):
     """Tests for send_notification()"""
 
@@ -175,6 +238,176 @@ class TestMacRunHdiutil(unittest.TestCase):
 
         self.assertEqual(BackendTools.mac_run_hdiutil("info")[0], 0)
 
+class TestParseMountinfo(unittest.TestCase):
+    """Tests for _parse_mountinfo()"""
+    #pylint: disable=protected-access
+
+    def setUp(self):
+        self.mount_points, self.sources = \
+        BackendTools._parse_mountinfo(Data.return_fake_mountinfo())
+
+    def tearDown(self):
+        del self.mount_points
+        del self.sources
+
+    def test_parse_mountinfo1(self):
+        """Test #1: Check simple mounts, and mounts with optional fields before the "-"."""
+        self.assertEqual(self.mount_points["proc"], "/proc")
+        self.assertEqual(self.sources["/proc"], "proc")
+        self.assertEqual(self.mount_points["/dev/mapper/loop0p1"], "/tmp/ddrescueguimtpt")
+        self.assertEqual(self.sources["/tmp/ddrescueguimtpt"], "/dev/mapper/loop0p1")
+
+    def test_parse_mountinfo2(self):
+        """Test #2: Check mount points with escaped spaces in them."""
+        self.assertEqual(self.mount_points["/dev/sdb1"], "/media/hamish/My Disk")
+        self.assertEqual(self.sources["/media/hamish/My Disk"], "/dev/sdb1")
+
+    def test_parse_mountinfo3(self):
+        """Test #3: Check bind mounts (the first mount point is kept for the source)."""
+        self.assertEqual(self.mount_points["/dev/sda1"], "/")
+        self.assertEqual(self.sources["/"], "/dev/sda1")
+        self.assertEqual(self.sources["/mnt/bind"], "/dev/sda1")
+
+    def test_parse_mountinfo4(self):
+        """Test #4: Check that invalid lines are ignored."""
+        self.assertEqual(len(self.sources), 5)
+
+class TestParseMountText(unittest.TestCase):
+    """Tests for _parse_mount_text()"""
+    #pylint: disable=protected-access
+
+    def test_parse_mount_text(self):
+        """Simple test for _parse_mount_text()"""
+        mount_points, sources = BackendTools._parse_mount_text(Data.return_fake_mount_output())
+
+        self.assertEqual(mount_points["/dev/disk2s1"], "/Volumes/USB")
+        self.assertEqual(sources["/Volumes/USB"], "/dev/disk2s1")
+        self.assertEqual(sources["/dev"], "devfs")
+
+        #The first mount point is kept for the source.
+        self.assertEqual(mount_points["/dev/disk1s1"], "/")
+        self.assertEqual(sources["/private/var/vm"], "/dev/disk1s1")
+
+class TestMacGetSystemEntities(unittest.TestCase):
+    """Tests for mac_get_system_entities()"""
+
+    def test_mac_get_system_entities1(self):
+        """Test #1: Get the system entities from hdiutil attach output, with warnings around it."""
+        entities = list(BackendTools.mac_get_system_entities(
+            Data.return_fake_hdiutil_attach_output()))
+
+        self.assertEqual(entities, [{"content-hint": "GUID_partition_scheme",
+                                     "dev-entry": "/dev/disk3",
+                                     "potentially-mountable": False,
+                                     "unmapped-content-hint": "GUID_partition_scheme"},
+                                    {"content-hint": "EFI", "dev-entry": "/dev/disk3s1",
+                                     "potentially-mountable": True},
+                                    {"content-hint": "Apple_HFS", "dev-entry": "/dev/disk3s2",
+                                     "mount-point": "/Volumes/My Disk",
+                                     "potentially-mountable": True, "volume-kind": "hfs"}])
+
+    def test_mac_get_system_entities2(self):
+        """Test #2: Check that nothing is returned if there's no "system-entities" key."""
+        self.assertEqual(list(BackendTools.mac_get_system_entities(
+            Data.return_fake_hdiutil_output_without_entities())), [])
+
+class TestParsePlist(unittest.TestCase):
+    """Tests for parse_plist()"""
+
+    def setUp(self):
+        self.output = Data.return_fake_hdiutil_attach_output()
+        BackendTools._PLIST_CACHE.clear() #pylint: disable=protected-access
+
+    def tearDown(self):
+        BackendTools._PLIST_CACHE.clear() #pylint: disable=protected-access
+
+        del self.output
+
+    def test_parse_plist1(self):
+        """Test #1: Parse a plist with text before and after it."""
+        plist = BackendTools.parse_plist(self.output)
+
+        self.assertEqual([disk["dev-entry"] for disk in plist["system-entities"]],
+                         ["/dev/disk3", "/dev/disk3s1", "/dev/disk3s2"])
+
+        self.assertEqual(plist["other-entities"], [{"dev-entry": "/dev/disk9"}])
+
+    def test_parse_plist2(self):
+        """Test #2: Check that the result is reused for the same plist."""
+        plist = BackendTools.parse_plist(self.output)
+
+        #Different text around the plist doesn't matter.
+        self.assertIs(BackendTools.parse_plist("Another warning\n"+self.output), plist)
+
+    def test_parse_plist3(self):
+        """Test #3: Check that a different plist is parsed again."""
+        plist = BackendTools.parse_plist(self.output)
+        other_plist = BackendTools.parse_plist(Data.return_fake_hdiutil_output_without_entities())
+
+        self.assertNotIn("system-entities", other_plist)
+        self.assertIsNot(BackendTools.parse_plist(self.output), plist)
+        self.assertEqual(BackendTools.parse_plist(self.output), plist)
+
+class TestMacGetImageInfo(unittest.TestCase):
+    """Tests for mac_get_image_info()"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+        #Count the times hdiutil would have been run, rather than running it.
+        self.calls = []
+        self.retval = 0
+        self.mac_run_hdiutil = BackendTools.mac_run_hdiutil
+        BackendTools.mac_run_hdiutil = self.fake_mac_run_hdiutil
+        BackendTools._IMAGE_INFO_CACHE.clear() #pylint: disable=protected-access
+
+    def tearDown(self):
+        BackendTools.mac_run_hdiutil = self.mac_run_hdiutil
+        BackendTools._IMAGE_INFO_CACHE.clear() #pylint: disable=protected-access
+        os.remove(self.path)
+
+        del self.path
+        del self.calls
+        del self.retval
+        del self.mac_run_hdiutil
+
+    def fake_mac_run_hdiutil(self, options):
+        """Stands in for mac_run_hdiutil(), so we know when the cache wasn't used."""
+        self.calls.append(options)
+        return self.retval, "Output "+unicode(len(self.calls))
+
+    def test_mac_get_image_info1(self):
+        """Test #1: Check that the output is reused if the image hasn't changed."""
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (0, "Output 1"))
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (0, "Output 1"))
+        self.assertEqual(self.calls, [["imageinfo", self.path, "-plist"]])
+
+    def test_mac_get_image_info2(self):
+        """Test #2: Check that hdiutil is run again if the image's size changes."""
+        BackendTools.mac_get_image_info(self.path)
+
+        with open(self.path, "ab") as image:
+            image.write(b"More data")
+
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (0, "Output 2"))
+
+    def test_mac_get_image_info3(self):
+        """Test #3: Check that hdiutil is run again if the image's modification time changes."""
+        BackendTools.mac_get_image_info(self.path)
+
+        modified_time = os.stat(self.path).st_mtime
+        os.utime(self.path, (modified_time+10, modified_time+10))
+
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (0, "Output 2"))
+
+    def test_mac_get_image_info4(self):
+        """Test #4: Check that failures aren't reused."""
+        self.retval = 1
+
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (1, "Output 1"))
+        self.assertEqual(BackendTools.mac_get_image_info(self.path), (1, "Output 2"))
+
 class TestIsMounted(unittest.TestCase):
     """Tests for is_mounted()"""
 
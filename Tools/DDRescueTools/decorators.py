@@ -32,15 +32,22 @@ import sys
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
 
+#The functions supporting each ddrescue version, as {version: {function name: function}}.
+#Filled in by define_versions() as the tools modules are imported.
+FUNCTIONS_BY_VERSION = {}
+
 def define_versions(function):
     """
     Reads the function docstring to find the
-    ddrescue versions the function supports.
+    ddrescue versions the function supports,
+    and registers the function for each of them.
     """
 
-    function.SUPPORTEDVERSIONS = []
+    function.SUPPORTEDVERSIONS = frozenset(
+        version.strip() for version in
+        function.__doc__.split("Works with ddrescue versions: ", 1)[1].split(","))
 
-    for version in function.__doc__.split(": ")[1].split(","):
-        function.SUPPORTEDVERSIONS.append(version.replace(" ", "").replace("\n", ""))
+    for version in function.SUPPORTEDVERSIONS:
+        FUNCTIONS_BY_VERSION.setdefault(version, {})[function.__name__] = function
 
     return function
@@ -37,12 +37,13 @@ if sys.version_info[0] == 3:
 @decorators.define_versions
 def get_outputpos_average_read_rate(split_line):
     """Get Output Position and Average Read Rate. Works with ddrescue versions: 1.21,1.22,1.23"""
-    return ' '.join(split_line[1:3]).replace(",", ""), split_line[8], split_line[9]
+    return (' '.join(token.replace(",", "") for token in split_line[1:3]),
+            split_line[8], split_line[9])
 
 @decorators.define_versions
 def get_unreadable_data(split_line):
     """Get Unreadable Data. Works with ddrescue versions: 1.21,1.22,1.23"""
-    return ' '.join(split_line[4:6]).replace(",", "")
+    return ' '.join(token.replace(",", "") for token in split_line[4:6])
 
 @decorators.define_versions
 def get_recovered_data_num_errors(split_line):
@@ -52,4 +53,4 @@ def get_recovered_data_num_errors(split_line):
 @decorators.define_versions
 def get_current_rate_inputpos(split_line):
     """Get Current Read Rate and Input Position. Works with ddrescue versions: 1.21,1.22,1.23"""
-    return ' '.join(split_line[7:9]), ' '.join(split_line[0:2]).replace(",", "")
+    return ' '.join(split_line[7:9]), ' '.join(token.replace(",", "") for token in split_line[0:2])
@@ -28,31 +28,21 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 #Import modules.
-import types
 import sys
 
-#Import tools modules.
-from . import allversions
-from . import one_point_forteen
-from . import one_point_eighteen
-from . import one_point_twenty
-from . import one_point_twenty_one
-from . import one_point_twenty_two
+#Import tools modules. Importing them registers their functions with decorators.
+from . import decorators
+from . import allversions #pylint: disable=unused-import
+from . import one_point_forteen #pylint: disable=unused-import
+from . import one_point_eighteen #pylint: disable=unused-import
+from . import one_point_twenty #pylint: disable=unused-import
+from . import one_point_twenty_one #pylint: disable=unused-import
+from . import one_point_twenty_two #pylint: disable=unused-import
 
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
 
-#Get a list of functions in all of our ddrescue tools modules.
-FUNCTIONS = []
-
-for Module in (allversions, one_point_forteen, one_point_eighteen, one_point_twenty,
-               one_point_twenty_one, one_point_twenty_two):
-
-    for function in dir(Module):
-        if isinstance(Module.__dict__.get(function), types.FunctionType):
-            FUNCTIONS.append(vars(Module)[function])
-
 def setup_for_ddrescue_version(ddrescue_version):
     """
     Selects the correct tools for our version of ddrescue.
@@ -77,10 +67,5 @@ def setup_for_ddrescue_version(ddrescue_version):
         #Supported version.
         best_version = ddrescue_version
 
-    suitable_functions = []
-
-    for function in FUNCTIONS: #pylint: disable=redefined-outer-name
-        if best_version in function.SUPPORTEDVERSIONS:
-            suitable_functions.append(function)
-
-    return suitable_functions
+    #Look up the functions for this version, rather than checking every function.
+    return list(decorators.FUNCTIONS_BY_VERSION.get(best_version, {}).values())
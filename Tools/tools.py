@@ -32,22 +32,35 @@ from __future__ import unicode_literals
 
 #Import other modules.
 import os
+import io
 import sys
 import subprocess
 import threading
 import shlex
 import logging
 import plistlib
+import re
 import time
+import itertools
+from xml.parsers.expat import ExpatError
 import wx
 
+#Use the C implementation of ElementTree if it's separate (Python 2). Python 3 uses
+#it automatically, and newer versions don't have cElementTree.
+try:
+    from xml.etree import cElementTree as ElementTree
+
+except ImportError:
+    from xml.etree import ElementTree
+
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
     str = bytes #pylint: disable=redefined-builtin,invalid-name
 
-    #Plist hack for Python 3.
-    plistlib.readPlistFromString = plistlib.loads #pylint: disable=no-member
+#Parses a plist from bytes. plistlib.loads() is Python 3's name for it, and
+#readPlistFromString() is deprecated (and gone in Python 3.9).
+PLIST_LOADS = getattr(plistlib, "loads", None) or plistlib.readPlistFromString
 
 #Determine if running on Linux or Mac.
 if "wxGTK" in wx.PlatformInfo:
@@ -71,14 +84,133 @@ elif "wxMac" in wx.PlatformInfo:
     LINUX = False
     PARTED_MAGIC = False
 
-AUTH_DIALOG_OPEN = False
+#Set when there's no auth dialog open (ie we're not waiting for the user to authenticate).
+AUTH_DONE = threading.Event()
+AUTH_DONE.set()
+
 APPICON = None
 
+#The images used by AuthWindow, loaded when it's first needed (see get_auth_window_images()).
+_AUTH_WINDOW_IMAGES = {}
+
+#The environment to run processes in. Computed once here rather than on every call
+#to start_process(). LC_ALL=C keeps the output of the tools we parse consistent.
+C_ENVIRON = dict(os.environ, LC_ALL="C")
+
+#The environment for running getdevinfo with sudo on macOS (as arguments for sudo).
+#This fixes import paths, because the support for running extra python processes
+#in py2app is poor. Built once here, as RESOURCEPATH (the app bundle's Resources
+#folder, wherever the app is) can't change while we're running.
+#NOTE: Will proably need to change w/ new major version of Py 3 eg 3.7, 3.8.
+MAC_GETDEVINFO_ENVIRON = [
+    "LC_ALL=C",
+    "PYTHONHOME="+RESOURCEPATH,
+    "PYTHONPATH="+':'.join(RESOURCEPATH+"/lib/"+path
+                           for path in ("python36.zip", "python3.6", "python3.6/lib-dynload",
+                                        "python3.6/site-packages.zip",
+                                        "python3.6/site-packages")),
+]
+
+#Signatures that kpartx's partition table readers look for, as (offset, bytes). If an image
+#has any of these, only kpartx can say whether it contains partitions.
+PARTITION_TABLE_SIGNATURES = (
+    (510, b"\x55\xaa"),           #DOS (MBR). kpartx also needs this (a protective MBR) for GPT.
+    (512, b"EFI PART"),           #GPT.
+    (0, b"ER"),                   #Apple Partition Map.
+    (508, b"\xda\xbe"),           #Sun.
+    (0, b"\x0b\xe5\xa9\x41"),     #SGI.
+    (0, b"\x0f\xac\xe0\xff"),     #PS3.
+    (512, b"\x57\x45\x56\x82"),   #BSD disklabel.
+    (524, b"\xee\xde\x0d\x60"),   #Solaris x86 VTOC.
+    (14848, b"\x0d\x60\x5e\xca"), #UnixWare.
+)
+
+#Signatures of filesystems that are created directly on a disk or partition, with no
+#partition table, as (offset, bytes).
+FILESYSTEM_SIGNATURES = (
+    (1080, b"\x53\xef"),          #ext2/3/4.
+    (0, b"XFSB"),                 #XFS.
+    (1024, b"H+"),                #HFS+.
+    (1024, b"HX"),                #HFSX.
+)
+
+#Splits strings into numeric and non-numeric parts (see natural_sort_key()).
+NUMBERS = re.compile(r"([0-9]+)")
+
+#A line of output, ending in a newline or carriage return (or the end of the output).
+LINE = re.compile(r"[^\r\n]*[\r\n]|[^\r\n]+$")
+
+#The versions of ddrescue we support.
+SUPPORTED_DDRESCUE_VERSIONS = frozenset(("1.14", "1.15", "1.16", "1.17", "1.18", "1.18.1",
+                                         "1.19", "1.20", "1.21", "1.22", "1.23"))
+
+#The major and minor parts of a ddrescue version number, eg "1.19" in "1.19.5" or "1.19-rc1".
+DDRESCUE_VERSION_NUMBER = re.compile(r"^([0-9]+\.[0-9]+)")
+
+#How long (in seconds) the output of "mount" can be reused for. This lets a single
+#logical operation (eg mount_disk() -> get_mount_point()) run "mount" only once.
+MOUNT_CACHE_MAX_AGE = 0.5
+
+#Cached mount information, stored as {key: (timestamp, value)}.
+#Invalidated whenever we mount or unmount something.
+_MOUNT_CACHE = {}
+
+#Cached output of hdiutil imageinfo (macOS only), stored as
+#{(image, mtime, size): (retval, output)}.
+_IMAGE_INFO_CACHE = {}
+
+#The version of ddrescue we're using. None until determine_ddrescue_version() has run,
+#as it can't change while we're running.
+_DDRESCUE_VERSION = None
+
+#The last plist parsed by parse_plist(), stored as {plist text: parsed plist}.
+_PLIST_CACHE = {}
+
+#Use a monotonic clock where available, so changes to the system time don't matter.
+_MONOTONIC = getattr(time, "monotonic", time.time)
+
+#Whether our version of lsblk has the -J option, for JSON output (Ubuntu 14.04's doesn't).
+#None until it has been checked, which only needs doing once.
+LSBLK_JSON_SUPPORTED = None
+
+#The helper scripts used to run privileged commands on Linux (see get_helper()), and
+#the commands each is used for. The first match wins.
+HELPERS = (
+    (re.compile(r"run_getdevinfo\.py"),
+     "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_getdevinfo.sh"),
+    (re.compile(r"umount|kpartx -d"),
+     "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_umount.sh"),
+    #Note: These are only used in the process of mounting files.
+    (re.compile(r"mount|kpartx -[la]|lsblk|partprobe"),
+     "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_mount.sh"),
+    (re.compile(r"^(?!.*killall).*ddrescue", re.DOTALL),
+     "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_ddrescue.sh"),
+)
+
 #Set up logging.
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 #Begin Mac Authentication Window.
+def get_auth_window_images():
+    """
+    Returns the icon, images and animations used by AuthWindow, as a dictionary.
+    They are only loaded the first time, as the window can be opened many times.
+    """
+
+    if not _AUTH_WINDOW_IMAGES:
+        _AUTH_WINDOW_IMAGES.update((
+            ("icon", wx.Icon(RESOURCEPATH+"/images/Logo.png", wx.BITMAP_TYPE_PNG)),
+            ("logo", wx.Bitmap(wx.Image(RESOURCEPATH+"/images/Logo.png", wx.BITMAP_TYPE_PNG))),
+            ("busy", wx.adv.Animation(RESOURCEPATH+"/images/Throbber.gif")),
+            ("green_pulse", wx.adv.Animation(RESOURCEPATH+"/images/GreenPulse.gif")),
+            ("red_pulse", wx.adv.Animation(RESOURCEPATH+"/images/RedPulse.gif")),
+            ("throbber_rest", wx.Bitmap(RESOURCEPATH+"/images/ThrobberRest.png",
+                                        wx.BITMAP_TYPE_PNG)),
+        ))
+
+    return _AUTH_WINDOW_IMAGES
+
 class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
     """
     A simple authentication dialog that is used when elevated privileges are required.
@@ -97,9 +229,15 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         self.panel = wx.Panel(self)
 
+        self.images = get_auth_window_images()
+
+        #Things scheduled with wx.CallLater() (see schedule()), so they can be stopped
+        #if the window is closed first.
+        self.timers = []
+
         #Set the frame's icon.
         global APPICON
-        APPICON = wx.Icon(RESOURCEPATH+"/images/Logo.png", wx.BITMAP_TYPE_PNG)
+        APPICON = self.images["icon"]
         wx.Frame.SetIcon(self, APPICON)
 
         self.create_text()
@@ -134,8 +272,7 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
     def create_other_widgets(self):
         """Create all other widgets for AuthenticationWindow"""
         #Create the image.
-        img = wx.Image(RESOURCEPATH+"/images/Logo.png", wx.BITMAP_TYPE_PNG)
-        self.program_logo = wx.StaticBitmap(self.panel, -1, wx.Bitmap(img))
+        self.program_logo = wx.StaticBitmap(self.panel, -1, self.images["logo"])
 
         #Create the password field.
         self.password_field = wx.TextCtrl(self.panel, -1, "",
@@ -144,13 +281,12 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         self.password_field.SetBackgroundColour((255, 255, 255))
 
         #Create the throbber.
-        self.busy = wx.adv.Animation(RESOURCEPATH+"/images/Throbber.gif")
-        self.green_pulse = wx.adv.Animation(RESOURCEPATH+"/images/GreenPulse.gif")
-        self.red_pulse = wx.adv.Animation(RESOURCEPATH+"/images/RedPulse.gif")
+        self.busy = self.images["busy"]
+        self.green_pulse = self.images["green_pulse"]
+        self.red_pulse = self.images["red_pulse"]
 
         self.throbber = wx.adv.AnimationCtrl(self.panel, -1, self.green_pulse)
-        self.throbber.SetInactiveBitmap(wx.Bitmap(RESOURCEPATH+"/images/ThrobberRest.png",
-                                                  wx.BITMAP_TYPE_PNG))
+        self.throbber.SetInactiveBitmap(self.images["throbber_rest"])
 
         self.throbber.SetClientSize(wx.Size(30, 30))
 
@@ -207,8 +343,8 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
     def on_auth_attempt(self, event=None): #pylint: disable=unused-argument
         """
-        Check the password is correct,
-        then either warn the user or call self.start_ddrescuegui().
+        Check the password is correct, in a separate thread.
+        on_auth_result() then either warns the user or closes the window.
         """
 
         #Disable the auth button (stops you from trying twice in quick succession).
@@ -216,25 +352,31 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         #Check the password is right.
         password = self.password_field.GetLineText(0)
-        cmd = subprocess.Popen("LC_ALL=C sudo -S echo 'Authentication Succeeded'",
+        cmd = subprocess.Popen(["sudo", "-S", "echo", "Authentication Succeeded"],
                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE, shell=True)
-
-        #Send the password to sudo through stdin,
-        #to avoid showing the user's password in the system/activity monitor.
-        cmd.stdin.write(password.encode()+b"\n")
-        cmd.stdin.close()
+                               stderr=subprocess.PIPE, env=C_ENVIRON)
 
         self.throbber.SetAnimation(self.busy)
         self.throbber.Play()
 
-        while cmd.poll() is None:
-            #wx.Yield()
-            time.sleep(0.04)
+        #Wait for sudo in another thread, so the throbber keeps moving.
+        BackgroundTask(self.check_auth, cmd, password)
 
-        output = cmd.stdout.read().decode("utf-8")
+    def check_auth(self, cmd, password):
+        """
+        Send the password to sudo, wait for it to finish, and pass the result
+        to on_auth_result() in the GUI thread.
+        """
+
+        #Send the password to sudo through stdin,
+        #to avoid showing the user's password in the system/activity monitor.
+        output = cmd.communicate(password.encode()+b"\n")[0].decode("utf-8")
 
-        if "Authentication Succeeded" in output:
+        wx.CallAfter(self.on_auth_result, "Authentication Succeeded" in output)
+
+    def on_auth_result(self, succeeded):
+        """Close the window if the password was right, otherwise warn the user."""
+        if succeeded:
             #Set the password field colour to green and disable the cancel button.
             self.password_field.SetBackgroundColour((192, 255, 192))
             self.password_field.SetValue("ABCDEFGHIJKLMNOPQRSTUVWXYZ123456789!£$%^&*()_+")
@@ -242,28 +384,25 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #Play the green pulse for one second.
             self.throbber.SetAnimation(self.green_pulse)
             self.throbber.Play()
-            wx.CallLater(1000, self.throbber.Stop)
-            wx.CallLater(1100, self.on_exit)
+            self.schedule(1000, self.throbber.Stop)
+            self.schedule(1100, self.on_exit)
 
         else:
             #Re-enable auth button.
             self.auth_button.Enable()
 
-            #Shake the window
+            #Shake the window. Schedule each movement, rather than sleeping between them,
+            #so the GUI keeps running. Finish back where we started.
             x_pos, y_pos = self.GetPosition()
-            count = 0
 
-            while count <= 6:
+            for count in range(8):
                 if count % 2 == 0:
-                    x_pos -= 10
+                    new_x_pos = x_pos - 10
 
                 else:
-                    x_pos += 10
+                    new_x_pos = x_pos
 
-                time.sleep(0.02)
-                self.SetPosition((x_pos, y_pos))
-                #wx.Yield()
-                count += 1
+                self.schedule(20*(count+1), self.SetPosition, (new_x_pos, y_pos))
 
             #Set the password field colour to pink, and select its text.
             self.password_field.SetBackgroundColour((255, 192, 192))
@@ -273,7 +412,13 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #Play the red pulse for one second.
             self.throbber.SetAnimation(self.red_pulse)
             self.throbber.Play()
-            wx.CallLater(1000, self.throbber.Stop)
+            self.schedule(1000, self.throbber.Stop)
+
+    def schedule(self, milliseconds, function, *args):
+        """Call function(*args) after the given delay, unless the window is closed first."""
+        #Forget about anything that has already run.
+        self.timers = [timer for timer in self.timers if timer.IsRunning()]
+        self.timers.append(wx.CallLater(milliseconds, function, *args))
 
     def test_auth(): #pylint: disable=no-method-argument
         """
@@ -282,42 +427,36 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         Otherwise return False.
         """
 
-        #Check the password is right.
-        cmd = subprocess.Popen("LC_ALL=C sudo -S echo 'Authentication Succeeded'",
-                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE, shell=True)
-
-        #Send the password to sudo through stdin,
-        #to avoid showing the user's password in the system/activity monitor.
-        cmd.stdin.close()
+        #sudo -n fails straight away, rather than asking for a password, if it doesn't
+        #have cached credentials. Block until it exits, rather than polling it.
+        cmd = subprocess.Popen(["sudo", "-n", "true"], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=C_ENVIRON)
 
-        while cmd.poll() is None:
-            time.sleep(0.04)
+        cmd.communicate()
 
-        output = cmd.stdout.read().decode("utf-8")
-
-        return "Authentication Succeeded" in output
+        return cmd.returncode == 0
 
     def run(): #pylint: disable=no-method-argument
         """
         Preauthenticates macOS users with the auth dialog.
         """
 
-        global AUTH_DIALOG_OPEN
-
         #Use cached credentials rather than open the auth window if possible.
         if AuthWindow.test_auth():
-            AUTH_DIALOG_OPEN = False
+            AUTH_DONE.set()
             return
 
-        AUTH_DIALOG_OPEN = True
+        AUTH_DONE.clear()
 
         AuthWindow().Show()
 
     def on_exit(self, event=None): #pylint: disable=unused-argument
         """Close AuthWindow() and exit"""
-        global AUTH_DIALOG_OPEN
-        AUTH_DIALOG_OPEN = False
+        AUTH_DONE.set()
+
+        #Don't let anything we scheduled run after we've been destroyed.
+        for timer in self.timers:
+            timer.Stop()
 
         self.Destroy()
 
@@ -325,29 +464,26 @@ class AuthWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
 def get_helper(cmd):
     """Figure out which helper script to use."""
-    helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux.sh"
-
-    if "run_getdevinfo.py" in cmd:
-        helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_getdevinfo.sh"
-
-    elif "umount" in cmd or "kpartx -d" in cmd:
-        helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_umount.sh"
-
-    elif ("mount" in cmd or "kpartx -l" in cmd or "kpartx -a" in cmd or "lsblk" in cmd
-          or "partprobe" in cmd):
-        #Note: These are only used in the process of mounting files.
-        helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_mount.sh"
-
-    elif "ddrescue" in cmd and "killall" not in cmd:
-        helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux_ddrescue.sh"
+    #Check each group of commands in order, as some of them overlap (eg "umount"
+    #contains "mount").
+    for pattern, helper in HELPERS:
+        if pattern.search(cmd):
+            break
 
     else:
         helper = "/usr/share/ddrescue-gui/Tools/helpers/runasroot_linux.sh"
 
-    return "pkexec "+helper
+    return ["pkexec", helper]
 
 def start_process(cmd, return_output=False, privileged=False):
-    """Start a given process, and return output and return value if needed"""
+    """
+    Start a given process, and return output and return value if needed.
+    cmd can be a string, or a list of arguments (use this when any of them are paths,
+    so spaces in them are handled properly).
+    """
+    if not isinstance(cmd, list):
+        cmd = shlex.split(cmd)
+
     #Save the command as it was passed, in case we need
     #to call recursively (pkexec auth failure/dismissal).
     origcmd = cmd
@@ -355,9 +491,7 @@ def start_process(cmd, return_output=False, privileged=False):
     #If this is to be a privileged process, add the helper script to the cmdline.
     if privileged:
         if LINUX:
-            helper = get_helper(cmd)
-
-            cmd = helper+" "+cmd
+            cmd = get_helper(' '.join(cmd))+cmd
 
         else:
             #Pre-authenticate with the auth dialog. Not py2 compatible, but only used
@@ -365,50 +499,46 @@ def start_process(cmd, return_output=False, privileged=False):
             if threading.current_thread() == threading.main_thread():
                 AuthWindow.run()
 
-            else:
-                wx.CallAfter(AuthWindow.run)
+                #Keep the GUI (and so the auth dialog) running until the user is done.
+                while not AUTH_DONE.is_set():
+                    wx.Yield()
+                    AUTH_DONE.wait(0.04)
 
+            else:
                 #Prevent a race condition.
-                global AUTH_DIALOG_OPEN
-                AUTH_DIALOG_OPEN = True
+                AUTH_DONE.clear()
+
+                wx.CallAfter(AuthWindow.run)
 
-            while AUTH_DIALOG_OPEN:
-                wx.Yield()
-                time.sleep(0.04)
+                #Sleep until the GUI thread is done, rather than polling.
+                AUTH_DONE.wait()
 
             #Set up the environemt here - sudo will clear it if we do it the
             #wrong way.
-            if "/Tools/run_getdevinfo.py" in cmd:
-                #Fix import paths on macOS.
-                #This is necessary because the support for running extra python processes
-                #in py2app is poor.
-                #NOTE: Will proably need to change w/ new major version of Py 3 eg 3.7, 3.8.
-                #FIXME later don't depend on being in /Applications.
-                environ = """LC_ALL="C" PYTHONHOME="/Applications/DDRescue-GUI.app/Contents/Resources" PYTHONPATH="/Applications/DDRescue-GUI.app/Contents/Resources/lib/python36.zip:/Applications/DDRescue-GUI.app/Contents/Resources/lib/python3.6:/Applications/DDRescue-GUI.app/Contents/Resources/lib/python3.6/lib-dynload:/Applications/DDRescue-GUI.app/Contents/Resources/lib/python3.6/site-packages.zip:/Applications/DDRescue-GUI.app/Contents/Resources/lib/python3.6/site-packages" """
+            if "/Tools/run_getdevinfo.py" in ' '.join(cmd):
+                environ = MAC_GETDEVINFO_ENVIRON
 
             else:
-                environ = """LC_ALL="C" """
+                environ = ["LC_ALL=C"]
 
-            cmd = "sudo -SH "+environ+cmd
+            cmd = ["sudo", "-SH"]+environ+cmd
 
-    environ = dict(os.environ, LC_ALL="C") #pylint: disable=redefined-variable-type
-
-    cmd = shlex.split(cmd)
-
-    logger.debug("start_process(): Starting process: "+' '.join(cmd))
+    logger.debug("start_process(): Starting process: %s", ' '.join(cmd))
     runcmd = subprocess.Popen(cmd, stdout=subprocess.PIPE,
-                              stderr=subprocess.STDOUT, env=environ,
+                              stderr=subprocess.STDOUT, env=C_ENVIRON,
                               shell=False)
 
     #Save the output, and runcmd.returncode,
     #as they tend to reset fairly quickly. Handle unicode properly.
-    output = read(runcmd)
+    #Join the lines once, for both the log message and the caller.
+    output = '\n'.join(read(runcmd))
 
     retval = int(runcmd.returncode)
 
     #Log this info in a debug message.
-    logger.debug("start_process(): Process: "+' '.join(cmd)+": Return Value: "
-                 +unicode(retval)+", output: \"\n\n"+'\n'.join(output)+"\"\n")
+    #Let logging format it, so the output isn't copied if debug messages are off.
+    logger.debug("start_process(): Process: %s: Return Value: %s, output: \"\n\n%s\"\n",
+                 ' '.join(cmd), retval, output)
 
     if privileged and (retval == 126 or retval == 127):
         #Try again, auth dismissed / bad password 3 times.
@@ -422,53 +552,74 @@ def start_process(cmd, return_output=False, privileged=False):
 
     else:
         #Return the return code, as well as the output.
-        return retval, '\n'.join(output)
+        return retval, output
 
-def read(cmd, testing=False): #pylint: disable=redefined-variable-type
+class BackgroundTask(threading.Thread):
     """
-    Read the cmd's output char by char, but do as little processing as
-    possible to improve startup performance
+    Runs function(*args, **kwargs) in a separate thread, so that other work
+    (eg other processes, or keeping the GUI responsive) can be done while it
+    runs. Call get_result() to wait for it to finish and get whatever it returned.
     """
 
-    #Get ready to run the command(s).
-    #Read up to 100 empty "" characters after the process finishes to
-    #make sure we get all the output.
-    counter = 0
-    line = str(b"")
-    line_list = []
+    def __init__(self, function, *args, **kwargs):
+        """Initialize and start the thread."""
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
 
-    while cmd.poll() is None or counter < 100:
-        char = cmd.stdout.read(1)
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.start()
 
-        if char == b"":
-            counter += 1
-            continue
+    def run(self):
+        """Main body of the thread, started with self.start()"""
+        try:
+            self.result = self.function(*self.args, **self.kwargs)
 
-        line += char
+        except Exception as error: #pylint: disable=broad-except
+            #Pass it on to whoever gets the result.
+            self.error = error
 
-        if char in (b"\n", b"\r"):
-            #Interpret as Unicode and remove "NULL" characters.
-            line = line.decode("UTF-8", errors="ignore").replace("\x00", "")
+    def get_result(self):
+        """
+        Wait for the function to finish, and return the result. If it raised
+        an exception, that is raised here instead.
+        """
+        self.join()
 
-            if testing:
-                line_list.append(line)
+        if self.error is not None:
+            raise self.error
 
-            else:
-                line_list.append(line.replace("\n", "").replace("\r", ""))
+        return self.result
+
+class BackgroundProcess(BackgroundTask):
+    """
+    Runs start_process() in a separate thread. Call get_result() to wait for it
+    to finish and get whatever start_process() returned.
+    """
 
-            #Reset line.
-            line = str(b"")
+    def __init__(self, cmd, return_output=False, privileged=False):
+        """Initialize and start the thread."""
+        BackgroundTask.__init__(self, start_process, cmd=cmd, return_output=return_output,
+                                privileged=privileged)
 
-    #Catch it if there's not a newline at the end. TODO Note fix for WxFixBoot.
-    if line != b"":
-        #Interpret as Unicode and remove "NULL" characters.
-        line = line.decode("UTF-8", errors="ignore").replace("\x00", "")
+def read(cmd, testing=False):
+    """
+    Wait for cmd to finish, and return its output as a list of lines (split at
+    newlines and carriage returns). If testing is True, the line endings are kept.
+    """
 
-        if testing:
-            line_list.append(line)
+    #Block until the process exits, collecting all its output, rather than polling it.
+    #Interpret it all as Unicode, and remove "NULL" characters, in one go.
+    output = cmd.communicate()[0].decode("UTF-8", errors="ignore").replace("\x00", "")
 
-        else:
-            line_list.append(line.replace("\n", "").replace("\r", ""))
+    #Split it into lines, including any at the end without a newline.
+    line_list = LINE.findall(output)
+
+    if not testing:
+        line_list = [line.rstrip("\r\n") for line in line_list]
 
     return line_list
 
@@ -479,51 +630,47 @@ def determine_ddrescue_version():
 
     Handles -pre and -rc versions too, by stripping that information
     from the version string and warning the user.
+
+    The result is cached, so ddrescue is only run (and the user only warned) once.
     """
 
+    global _DDRESCUE_VERSION
+
+    if _DDRESCUE_VERSION is not None:
+        return _DDRESCUE_VERSION
+
     #Use correct command.
     if LINUX:
-        cmd = "ddrescue --version"
+        cmd = ["ddrescue", "--version"]
 
     else:
-        cmd = RESOURCEPATH+"/ddrescue --version"
+        cmd = [RESOURCEPATH+"/ddrescue", "--version"]
 
     ddrescue_version = \
-    start_process(cmd=cmd, return_output=True)[1].split("\n")[0].split(" ")[-1]
+    start_process(cmd=cmd, return_output=True)[1].split("\n", 1)[0].split(" ")[-1]
 
     logger.info("ddrescue version "+ddrescue_version+"...")
 
-    #Remove the -rc and -pre flags if they exist.
-    #But note if we are running a prerelease version so we can warn the user.
-    prerelease = False
+    #Note if we are running a prerelease version so we can warn the user.
+    prerelease = ("-rc" in ddrescue_version or "-pre" in ddrescue_version)
 
-    if "-rc" in ddrescue_version:
-        prerelease = True
-        ddrescue_version = ddrescue_version.split("-rc")[0]
+    #Remove the -rc and -pre flags, and ignore any minor changes.
+    #eg: treat 1.19.5 and 1.19-rc1 as 1.19 - strip anything after that off.
+    match = DDRESCUE_VERSION_NUMBER.match(ddrescue_version)
 
-    elif "-pre" in ddrescue_version:
-        prerelease = True
-        ddrescue_version = ddrescue_version.split("-pre")[0]
-
-    #Ignore any monitor changes. eg: treat 1.19.5 as 1.19 - strip anything after that off.
-    ddrescue_version = '.'.join(ddrescue_version.split(".")[:2])
+    if match is not None:
+        ddrescue_version = match.group(1)
 
     #Warn if not on a supported version.
-    if ddrescue_version not in ("1.14", "1.15", "1.16", "1.17", "1.18", "1.18.1", "1.19", "1.20",
-                                "1.21", "1.22", "1.23"):
+    if ddrescue_version not in SUPPORTED_DDRESCUE_VERSIONS:
         logger.warning("Unsupported ddrescue version "+ddrescue_version+"! "
                        "Please upgrade DDRescue-GUI if possible.")
 
-        dlg = wx.MessageDialog(None, "You are using an unsupported version of ddrescue! "
-                               "You are strongly advised to upgrade "
-                               "DDRescue-GUI if there is an update available. "
-                               "You can use this GUI anyway, but you may find "
-                               "there are formatting or other issues when "
-                               "performing your recovery.",
-                               'DDRescue-GUI - Unsupported ddrescue version!',
-                               wx.OK | wx.ICON_ERROR)
-        dlg.ShowModal()
-        dlg.Destroy()
+        show_message_dialog(None, "You are using an unsupported version of ddrescue! You are "
+                            "strongly advised to upgrade DDRescue-GUI if there is an update "
+                            "available. You can use this GUI anyway, but you may find there are "
+                            "formatting or other issues when performing your recovery.",
+                            "DDRescue-GUI - Unsupported ddrescue version!", wx.OK | wx.ICON_ERROR)
 
     #Warn if on a prerelease version.
     if prerelease:
@@ -531,18 +678,22 @@ def determine_ddrescue_version():
                        "This may cause bugs/errors in the GUI, and may "
                        "result in an unsuccessful recovery.")
 
-        dlg = wx.MessageDialog(None, "You are using a prerelease version of ddrescue! "
-                               "You can contnue anyway, but you may find "
-                               "there are formatting or other issues when "
-                               "performing your recovery, or that your recovery "
-                               "is unsuccessful.",
-                               'DDRescue-GUI - Prerelease ddrescue version!',
-                               wx.OK | wx.ICON_ERROR)
-        dlg.ShowModal()
-        dlg.Destroy()
+        show_message_dialog(None, "You are using a prerelease version of ddrescue! You can "
+                            "contnue anyway, but you may find there are formatting or other issues "
+                            "when performing your recovery, or that your recovery is unsuccessful.",
+                            "DDRescue-GUI - Prerelease ddrescue version!", wx.OK | wx.ICON_ERROR)
 
+    _DDRESCUE_VERSION = ddrescue_version
     return ddrescue_version
 
+def natural_sort_key(text):
+    """
+    Key function for sorting strings with numbers in them in a way that makes sense to
+    people, eg "Partition 2" before "Partition 10".
+    """
+
+    return [int(part) if part.isdigit() else part for part in NUMBERS.split(text)]
+
 def create_unique_key(dictionary, data, length):
     """
     Create a unqiue dictionary key of length for dictionary dictionary for the item data.
@@ -551,55 +702,84 @@ def create_unique_key(dictionary, data, length):
     The key will also start with '...'.
     """
 
-    #Only add numbers to the key if needed.
-    if "..."+data[-length:] in dictionary.keys():
-        #digit to add to the end of the key.
-        digit = 0
-        key = data
+    suffix = data[-length:]
 
-        while True:
-            #Add a digit to the end of the key to get a new key, repeat until the key is unique.
-            digit_length = len(unicode(digit))
+    #Replace the end of the key with "~" and a digit (counting up from 2, as data itself
+    #is the first) until it is unique. Only add numbers to the key if needed.
+    for digit in itertools.count(2):
+        #Only start the key with '...' if it is length chars long.
+        if len(suffix) < length:
+            key = suffix
 
-            if key[-digit_length:] == digit and key[-digit_length-1] == "~":
-                #Remove the old non-unique digit and underscore at the end.
-                key = key[0:-digit_length-1]
-
-            #Add 1 to the digit.
-            digit += 1
+        else:
+            key = "..."+suffix
 
-            key = key+unicode(digit)
-            key = key[-length:]
+        if key not in dictionary:
+            #Yay! Unique!
+            return key
 
-            if "..."+key not in dictionary.keys():
-                #Yay! Unique!
-                key = "..."+key
+        tag = "~"+unicode(digit)
+        suffix = data[-length:][:length-len(tag)]+tag
 
-    else:
-        key = data[-length:]
-        key = "..."+key
+def show_message_dialog(parent, message, caption, style):
+    """Show a (modal) wx.MessageDialog with the given settings, and destroy it afterwards."""
+    dlg = wx.MessageDialog(parent, message, caption, style)
 
-    #Remove '...' if key is shorter than length+3 chars (to account for...).
-    if len(key) < length+3:
-        key = key[3:]
+    try:
+        dlg.ShowModal()
 
-    return key
+    finally:
+        dlg.Destroy()
 
 def send_notification(msg):
-    """Send a notification, created to reduce clutter in the rest of the code."""
+    """
+    Send a notification, created to reduce clutter in the rest of the code.
+    Doesn't wait for it to be sent, as nothing needs to know whether it worked.
+    """
     if LINUX:
         #Use notify-send. *** Sometimes doesn't work as root. Find uid of logged-in user? ***
-        start_process(cmd="notify-send 'DDRescue-GUI' '"+msg
-                      +"' -i /usr/share/pixmaps/ddrescue-gui.png", return_output=False)
+        #Pass msg as a single argument, so it never needs quoting.
+        cmd = ["notify-send", "DDRescue-GUI", msg, "-i", "/usr/share/pixmaps/ddrescue-gui.png"]
 
     else:
         #Use Terminal-notifier.
-        start_process(cmd=RESOURCEPATH
-                      +"""/other/terminal-notifier.app/Contents/MacOS/terminal-notifier """ \
-                      +"""-title "DDRescue-GUI" -message \""""+msg+"""\" """ \
-                      +"""-sender org.pythonmac.unspecified.DDRescue-GUI """ \
-                      +"""-group \"DDRescue-GUI\"""",
-                      return_output=False)
+        notifier = RESOURCEPATH+"/other/terminal-notifier.app/Contents/MacOS/terminal-notifier"
+        cmd = [notifier, "-title", "DDRescue-GUI", "-message", msg,
+               "-sender", "org.pythonmac.unspecified.DDRescue-GUI", "-group", "DDRescue-GUI"]
+
+    #Run it in the background. The thread waits for the notifier to exit, so it is
+    #cleaned up properly, without holding up the GUI.
+    BackgroundProcess(cmd=cmd, return_output=False)
+
+def may_have_partition_table(image):
+    """
+    Checks the start of the given image for a partition table or a bare filesystem,
+    without running any external tools.
+
+    Returns False only if the image is a bare filesystem (ext2/3/4, XFS or HFS+) with
+    none of the signatures that kpartx's partition table readers look for.
+    Otherwise (including if the image can't be read), returns True, so the caller
+    falls back to asking kpartx.
+    """
+
+    try:
+        with open(image, "rb") as image_file:
+            header = image_file.read(15360)
+
+    except (IOError, OSError):
+        return True
+
+    if _has_signature(header, PARTITION_TABLE_SIGNATURES):
+        #Note that FAT and NTFS boot sectors have a DOS boot signature, but kpartx's DOS
+        #reader doesn't check the partition entries strictly enough to rule them out.
+        return True
+
+    return not _has_signature(header, FILESYSTEM_SIGNATURES)
+
+def _has_signature(header, signatures):
+    """Returns True if the given header contains any of the given (offset, bytes) signatures."""
+    return any(header[offset:offset+len(signature)] == signature
+               for offset, signature in signatures)
 
 def determine_output_file_type(SETTINGS, disk_info): #pylint: disable=invalid-name
     """Determines output File Type (partition or Device)"""
@@ -611,91 +791,395 @@ def determine_output_file_type(SETTINGS, disk_info): #pylint: disable=invalid-na
 
         if output_file_type == "Device":
             if LINUX:
-                retval, output = start_process(cmd="kpartx -l "+SETTINGS["OutputFile"],
+                retval, output = start_process(cmd=["kpartx", "-l", SETTINGS["OutputFile"]],
                                                return_output=True, privileged=True)
                 output = output.split("\n")
 
             else:
-                retval, output = mac_run_hdiutil(options="imageinfo "+SETTINGS["OutputFile"]
-                                                 +" -plist")
+                retval, output = mac_get_image_info(SETTINGS["OutputFile"])
 
     else:
-        if LINUX:
+        if LINUX and not may_have_partition_table(SETTINGS["OutputFile"]):
+            #A bare filesystem, so kpartx wouldn't find anything. Skip it.
+            retval, output = 0, [""]
+
+        elif LINUX:
             #If list of partitions is empty (or 1 partition), we have a partition.
-            retval, output = start_process(cmd="kpartx -l "+SETTINGS["OutputFile"],
+            retval, output = start_process(cmd=["kpartx", "-l", SETTINGS["OutputFile"]],
                                            return_output=True, privileged=True)
             output = output.split("\n")
 
         else:
-            retval, output = mac_run_hdiutil(options="imageinfo "+SETTINGS["OutputFile"]
-                                             +" -plist")
+            retval, output = mac_get_image_info(SETTINGS["OutputFile"])
 
         if output == [""] or len(output) == 1 or "whole disk" in output:
-            output_file_type = "partition"
+            output_file_type = "Partition"
 
         else:
             output_file_type = "Device"
 
-    if not LINUX and output != "":
-        #Parse the plist (Property List).
-        output = plistlib.readPlistFromString(output.encode())
+    if not LINUX and retval == 0 and output_file_type == "Device":
+        #Parse the plist (Property List). Only the partition list of a device is used
+        #by the caller, so don't bother parsing it otherwise.
+        output = parse_plist(output)
 
     return output_file_type, retval, output
 
+def parse_plist(output):
+    """
+    Parses the given plist (Property List), eg from hdiutil -plist, and returns it.
+    Anything before or after the plist itself (eg warnings from hdiutil, which are
+    mixed in with its output) is ignored.
+
+    The result is shared with later calls for the same plist, so callers must not
+    modify it (copy it first if needed).
+    """
+
+    plist_text = _get_plist_text(output)
+
+    #Reuse the result if we just parsed the same plist (eg cached imageinfo output when
+    #the output file is mounted again).
+    plist = _PLIST_CACHE.get(plist_text)
+
+    if plist is None:
+        plist = PLIST_LOADS(plist_text.encode())
+        _PLIST_CACHE.clear()
+        _PLIST_CACHE[plist_text] = plist
+
+    return plist
+
+def _get_plist_text(output):
+    """Returns just the plist from the given output, without anything before or after it."""
+    start = output.find("<?xml")
+    end = output.rfind("</plist>")
+
+    if start != -1 and end != -1:
+        output = output[start:end+len("</plist>")]
+
+    return output
+
+def mac_get_system_entities(output):
+    """
+    Yields each entry in the "system-entities" list of the given plist output from
+    hdiutil, as a dictionary (eg with "dev-entry" and "mount-point" keys).
+
+    This only processes as much of the plist as it needs to, rather than parsing all of it
+    with parse_plist(). Only strings, booleans and integers are supported as values.
+    """
+
+    plist = io.BytesIO(_get_plist_text(output).encode("utf-8"))
+
+    depth = 0
+    entities_depth = None
+    previous_key = None
+    key = None
+    entity = None
+
+    for event, element in ElementTree.iterparse(plist, events=("start", "end")):
+        if event == "start":
+            depth += 1
+
+            #The list we want is the value after the "system-entities" key.
+            if (entities_depth is None and element.tag == "array"
+                    and previous_key == "system-entities"):
+                entities_depth = depth
+
+            elif entities_depth is not None and depth == entities_depth+1:
+                entity = {}
+
+            previous_key = None
+            continue
+
+        if entities_depth is None:
+            if element.tag == "key":
+                previous_key = element.text
+
+        elif depth == entities_depth:
+            #End of the list. Stop here.
+            return
+
+        elif depth == entities_depth+1:
+            yield entity
+            element.clear()
+
+        elif depth == entities_depth+2:
+            if element.tag == "key":
+                key = element.text
+
+            elif element.tag in ("true", "false"):
+                entity[key] = (element.tag == "true")
+
+            elif element.tag == "integer":
+                entity[key] = int(element.text)
+
+            else:
+                entity[key] = element.text or ""
+
+        depth -= 1
+
+def mac_get_image_info(image):
+    """
+    Runs hdiutil imageinfo on the given image, and returns the return value and
+    the (unparsed) plist output. hdiutil can take a long time with big images, so
+    successful results are reused until the image is modified.
+    """
+
+    try:
+        image_stat = os.stat(image)
+        key = (image, image_stat.st_mtime, image_stat.st_size)
+
+    except OSError:
+        key = None
+
+    if key is not None and key in _IMAGE_INFO_CACHE:
+        logger.debug("mac_get_image_info(): Using cached hdiutil imageinfo output for "
+                     + image+"...")
+
+        return _IMAGE_INFO_CACHE[key]
+
+    retval, output = mac_run_hdiutil(options=["imageinfo", image, "-plist"])
+
+    if retval == 0 and key is not None:
+        _IMAGE_INFO_CACHE[key] = (retval, output)
+
+    return retval, output
+
 def mac_get_device_name_mount_point(output):
     """
     Get the device name and mount point of an output file,
     given output from hdiutil mount -plist
     """
 
-    #Parse the plist (Property List).
+    #Parse the plist (Property List). We only need the first two disks.
     try:
-        hdiutil_output = plistlib.readPlistFromString(output.encode())
+        disks = list(itertools.islice(mac_get_system_entities(output), 2))
 
     except UnicodeDecodeError:
         return None, None, "UnicodeError"
 
     #Find the disk and get the mountpoint.
-    if len(hdiutil_output["system-entities"]) > 1:
-        mounted_disk = hdiutil_output["system-entities"][1]
-
-    else:
-        mounted_disk = hdiutil_output["system-entities"][0]
+    mounted_disk = disks[-1]
 
     return mounted_disk["dev-entry"], mounted_disk["mount-point"], True
 
+def mac_get_attached_images():
+    """
+    Returns the device names (eg /dev/disk2) of all attached disk images, from
+    the output of hdiutil info. Returns None if that output couldn't be parsed.
+    """
+
+    output = start_process(cmd=["hdiutil", "info", "-plist"], return_output=True)[1]
+
+    try:
+        hdiutil_output = parse_plist(output)
+
+    except (ValueError, ExpatError):
+        logger.warning("mac_get_attached_images(): Couldn't parse output of hdiutil info!")
+        return None
+
+    devices = []
+
+    for image in hdiutil_output.get("images", []):
+        dev_entries = [entity["dev-entry"] for entity in image.get("system-entities", [])
+                       if "dev-entry" in entity]
+
+        #The whole disk has the shortest name (eg /dev/disk2 rather than /dev/disk2s1).
+        if dev_entries:
+            devices.append(min(dev_entries, key=len))
+
+    return devices
+
 def mac_run_hdiutil(options):
     """
     Runs hdiutil on behalf of the rest of the program when called.
     Tries to handle and fix hdiutil errors if they occur.
+    options can be a string, or a list of arguments.
     """
 
-    retval, output = start_process(cmd="hdiutil "+options, return_output=True, privileged=True)
+    if not isinstance(options, list):
+        options = shlex.split(options)
+
+    retval, output = start_process(cmd=["hdiutil"]+options, return_output=True, privileged=True)
 
     #Handle this common error - image in use.
     if "Resource temporarily unavailable" in output or retval != 0:
         logger.warning("mac_run_hdiutil(): Attempting to fix hdiutil resource error...")
-        #Fix by detaching all disks - certain disks eg system disk will fail, but it should fix
-        #our problem. On OS X >= 10.11 can check for "(disk image)", but cos we support 10.9 &
-        #10.10, we have to just detach all possible disks and ignore failures. No need for another
-        #try-except cos start_process doesn't throw errors.
-        for line in start_process(cmd="diskutil list", return_output=True)[1].split("\n"):
-            try:
-                if line.split()[0].split("/")[1] == "dev":
-                    #This is a line with a device name on it.
-                    logger.warning("mac_run_hdiutil(): Attempting to detach "
-                                   + line.split()[0]+"...")
-
-                    start_process(cmd="hdiutil detach "+line.split()[0], privileged=True)
-
-            except IndexError:
-                pass
+        #Fix by detaching all disk images. hdiutil info tells us which disks these are, in
+        #one go, and works on all the versions of OS X we support.
+        devices = mac_get_attached_images()
+
+        if devices is None:
+            #Fall back to detaching all disks - certain disks eg system disk will fail, but it
+            #should fix our problem. No need for a try-except cos start_process doesn't throw
+            #errors. Only the first word of each line is needed.
+            disk_list = start_process(cmd=["diskutil", "list"], return_output=True)[1]
+            devices = [line.split(None, 1)[0] for line in disk_list.splitlines()
+                       if line.startswith("/dev/")]
+
+        #Detach them all with one privileged shell, rather than running sudo for each one.
+        #The devices are passed as arguments to the shell, so they don't need quoting.
+        #Each detach is independent (and failures are ignored), so run them all at once
+        #and wait for them to finish.
+        if devices:
+            logger.warning("mac_run_hdiutil(): Attempting to detach "+', '.join(devices)+"...")
+            start_process(cmd=["sh", "-c",
+                               'for device in "$@"; do hdiutil detach "$device" & done; wait',
+                               "sh"]+devices, privileged=True)
 
         #Try again.
-        retval, output = start_process(cmd="hdiutil "+options, return_output=True, privileged=True)
+        retval, output = start_process(cmd=["hdiutil"]+options, return_output=True,
+                                       privileged=True)
+
+    #What is mounted may have changed (eg when attaching or detaching images).
+    _invalidate_mount_cache()
 
     return retval, output
 
+def _get_cached_mount_info(key, loader, max_age=None):
+    """
+    Returns the mount information cached under key, calling loader() to refresh it
+    if it is more than max_age (default: MOUNT_CACHE_MAX_AGE) seconds old.
+    """
+
+    if max_age is None:
+        max_age = MOUNT_CACHE_MAX_AGE
+
+    now = _MONOTONIC()
+    timestamp, value = _MOUNT_CACHE.get(key, (0.0, None))
+
+    if value is None or now - timestamp >= max_age:
+        value = loader()
+        _MOUNT_CACHE[key] = (now, value)
+
+    return value
+
+def _get_mount_text(max_age=None):
+    """Returns the output of "mount" (cached)."""
+    return _get_cached_mount_info("text", lambda: start_process(["mount"], return_output=True)[1],
+                                  max_age)
+
+def _unescape_mountinfo(field):
+    """Decodes the octal escapes (eg \\040 for a space) used in /proc/self/mountinfo."""
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), field)
+
+def _linux_mounts():
+    """
+    Reads /proc/self/mountinfo (Linux only), rather than running "mount".
+    Returns two dictionaries: {source: mount point} and {mount point: source}.
+    """
+
+    try:
+        with open("/proc/self/mountinfo", "rb") as mountinfo:
+            data = mountinfo.read()
+
+    except (IOError, OSError):
+        #Eg /proc isn't mounted. Fall back to running "mount".
+        logger.warning("_linux_mounts(): Couldn't read /proc/self/mountinfo! Using mount...")
+        return _parse_mount_text(_get_mount_text())
+
+    return _parse_mountinfo(data.decode("UTF-8", errors="ignore"))
+
+def _parse_mountinfo(mountinfo):
+    """
+    Parses the contents of /proc/self/mountinfo.
+    Returns two dictionaries: {source: mount point} and {mount point: source}.
+    """
+
+    mount_points = {}
+    sources = {}
+
+    for line in mountinfo.splitlines():
+        fields = line.split()
+
+        #There are a variable number of optional fields, ended by "-". The filesystem
+        #type and the source follow that.
+        try:
+            source = _unescape_mountinfo(fields[fields.index("-")+2])
+
+        except (ValueError, IndexError):
+            continue
+
+        mount_point = _unescape_mountinfo(fields[4])
+
+        #Keep the first mount point for each source, like get_mount_point() always has.
+        mount_points.setdefault(source, mount_point)
+        sources[mount_point] = source
+
+    return mount_points, sources
+
+def _parse_mount_text(mount_info):
+    """
+    Parses the output of "mount" (used on macOS).
+    Returns two dictionaries: {source: mount point} and {mount point: source}.
+    """
+
+    mount_points = {}
+    sources = {}
+
+    for line in mount_info.splitlines():
+        split_line = line.split()
+
+        if split_line:
+            #Keep the first mount point for each source, like get_mount_point() always has.
+            mount_points.setdefault(split_line[0], split_line[2])
+            sources[split_line[2]] = split_line[0]
+
+    return mount_points, sources
+
+def _get_mount_tables(max_age=None):
+    """
+    Returns ({source: mount point}, {mount point: source}) for everything that is
+    mounted (cached). Lookups of things that aren't mounted are answered from these
+    too, so negative results don't need another look at the mount table.
+    """
+
+    if LINUX:
+        loader = _linux_mounts
+
+    else:
+        loader = lambda: _parse_mount_text(_get_mount_text(max_age))
+
+    return _get_cached_mount_info("tables", loader, max_age)
+
+def _invalidate_mount_cache():
+    """Forget all cached mount information, eg after mounting or unmounting something."""
+    _MOUNT_CACHE.clear()
+
+#Platform-specific helpers for the mount functions below. We can't change platform
+#while running, so choose them once here, rather than checking LINUX on every call.
+if LINUX:
+    def _fix_path(path):
+        """Returns path unchanged (only needed on macOS)."""
+        return path
+
+    def _mount_cmd(partition, mount_point, options):
+        """Returns the command to mount partition at mount_point."""
+        return ["mount"]+shlex.split(options)+[partition, mount_point]
+
+    def _unmount_cmd(disk):
+        """Returns the command to unmount disk."""
+        return ["umount", disk]
+
+else:
+    def _fix_path(path):
+        """
+        OS X fix: Handle paths in /tmp as paths in /private/tmp (/tmp is a symlink).
+        Only the start of the path is changed, so paths that already start with
+        /private/tmp, or have "/tmp" elsewhere in them, are left alone.
+        """
+        if path == "/tmp" or path.startswith("/tmp/"):
+            return "/private"+path
+
+        return path
+
+    def _mount_cmd(partition, mount_point, options):
+        """Returns the command to mount partition at mount_point (uses diskutil)."""
+        return ["diskutil", "mount"]+shlex.split(options)+["-mountPoint", mount_point, partition]
+
+    def _unmount_cmd(disk):
+        """Returns the command to unmount disk (uses diskutil)."""
+        return ["diskutil", "umount", disk]
+
 def is_mounted(partition, mount_point=None):
     """
     Checks if the given partition is mounted.
@@ -705,35 +1189,23 @@ def is_mounted(partition, mount_point=None):
     Return boolean True/False.
     """
 
-    if mount_point is None:
-        logger.debug("is_mounted(): Checking if "+partition+" is mounted...")
-        mount_info = start_process("mount", return_output=True)[1]
+    mount_points, sources = _get_mount_tables()
 
-        disk_is_mounted = False
+    if mount_point is None:
+        logger.debug("is_mounted(): Checking if %s is mounted...", partition)
 
         #OS X fix: Handle paths with /tmp in them, as paths with /private/tmp.
-        if not LINUX and "/tmp" in partition:
-            partition = partition.replace("/tmp", "/private/tmp")
+        partition = _fix_path(partition)
 
         #LINUX fix: Accept any mountpoint when called with just one argument.
-        for line in mount_info.split("\n"):
-            if len(line) != 0:
-                if line.split()[0] == partition or line.split()[2] == partition:
-                    disk_is_mounted = True
-                    break
+        disk_is_mounted = (partition in mount_points or partition in sources)
 
     else:
-        #Check where it's mounted to.
-        logger.debug("is_mounted(): Checking if "+partition+" is mounted at "+mount_point+"...")
-
-        disk_is_mounted = False
+        #Check where it's mounted to, using the same snapshot of the mount table.
+        logger.debug("is_mounted(): Checking if %s is mounted at %s...", partition, mount_point)
 
         #OS X fix: Handle paths with /tmp in them, as paths with /private/tmp.
-        if not LINUX and "/tmp" in mount_point:
-            mount_point = mount_point.replace("/tmp", "/private/tmp")
-
-        if get_mount_point(partition) == mount_point:
-            disk_is_mounted = True
+        disk_is_mounted = (mount_points.get(partition) == _fix_path(mount_point))
 
     if disk_is_mounted:
         logger.debug("is_mounted(): It is. Returning True...")
@@ -748,16 +1220,7 @@ def get_mount_point(partition):
     Otherwise, return None"""
     logger.info("get_mount_point(): Trying to get mount point of partition "+partition+"...")
 
-    mount_info = start_process("mount", return_output=True)[1]
-    mount_point = None
-
-    for line in mount_info.split("\n"):
-        split_line = line.split()
-
-        if len(split_line) != 0:
-            if partition == split_line[0]:
-                mount_point = split_line[2]
-                break
+    mount_point = _get_mount_tables()[0].get(partition)
 
     if mount_point != None:
         logger.info("get_mount_point(): Found it! mount_point is "+mount_point+"...")
@@ -767,6 +1230,17 @@ def get_mount_point(partition):
 
     return mount_point
 
+def get_mount_points(partitions):
+    """
+    Returns a dictionary of {partition: mount point, or None} for all of the
+    given partitions, using one snapshot of the mount table for all of them.
+    """
+    logger.info("get_mount_points(): Getting mount points of "+', '.join(partitions)+"...")
+
+    mount_points = _get_mount_tables()[0]
+
+    return dict((partition, mount_points.get(partition)) for partition in partitions)
+
 def mount_disk(partition, mount_point, options=""):
     """Mounts the given partition.
     partition is the partition to mount.
@@ -782,35 +1256,44 @@ def mount_disk(partition, mount_point, options=""):
         logger.info("mount_disk(): Preparing to mount "+partition+" at "+mount_point
                     +" with no extra options...")
 
-    mount_info = start_process("mount", return_output=True)[1]
-
-    #There is a partition mounted here. Check if it's ours.
-    if mount_point == get_mount_point(partition):
-        #The correct partition is already mounted here.
-        logger.debug("mount_disk(): partition: "+partition+" was already mounted at: "
-                     +mount_point+". Continuing...")
-        return 0
+    if os.path.isdir(mount_point) is False:
+        #Create the dir. Nothing can be mounted there yet, so there's no need to
+        #look at the mount table. Only use a privileged mkdir if we aren't allowed
+        #to create it ourselves (eg if we aren't already running as root).
+        try:
+            os.makedirs(mount_point)
 
-    elif mount_point in mount_info:
-        #Something else is in the way. Unmount that partition, and continue.
-        logger.warning("mount_disk(): Unmounting filesystem in the way at "+mount_point+"...")
-        if unmount_disk(mount_point) != 0:
-            logger.error("mount_disk(): Couldn't unmount "+mount_point
-                         +", preventing the mounting of "+partition+"! Skipping mount attempt.")
-            return False
+        except OSError:
+            start_process(["mkdir", "-p", mount_point], privileged=True)
 
-    #Create the dir if needed.
-    if os.path.isdir(mount_point) is False:
-        start_process("mkdir -p "+mount_point, privileged=True)
+    else:
+        #Use one snapshot of what's mounted where for both checks. Don't rule anything out
+        #with os.path.ismount(), as that misses bind mounts from the same filesystem.
+        mount_points, sources = _get_mount_tables()
+
+        #There is a partition mounted here. Check if it's ours.
+        if mount_point == mount_points.get(partition):
+            #The correct partition is already mounted here.
+            logger.debug("mount_disk(): partition: %s was already mounted at: %s. "
+                         "Continuing...", partition, mount_point)
+            return 0
+
+        elif _fix_path(mount_point) in sources:
+            #Something else is in the way. Unmount that partition, and continue.
+            logger.warning("mount_disk(): Unmounting filesystem in the way at "
+                           +mount_point+"...")
+
+            if unmount_disk(mount_point, already_mounted=True) != 0:
+                logger.error("mount_disk(): Couldn't unmount "+mount_point+", preventing the "
+                             "mounting of "+partition+"! Skipping mount attempt.")
+                return False
 
     #Mount the device to the mount point.
-    #Use diskutil on OS X.
-    if LINUX:
-        retval = start_process("mount "+options+" "+partition+" "+mount_point, privileged=True)
+    #Uses diskutil on OS X.
+    retval = start_process(_mount_cmd(partition, mount_point, options), privileged=True)
 
-    else:
-        retval = start_process("diskutil mount "+options+" "+" -mountPoint "
-                               +mount_point+" "+partition, privileged=True)
+    #What is mounted has (probably) changed.
+    _invalidate_mount_cache()
 
     if retval == 0:
         logger.debug("mount_disk(): Successfully mounted partition!")
@@ -820,12 +1303,16 @@ def mount_disk(partition, mount_point, options=""):
 
     return retval
 
-def unmount_disk(disk):
-    """Unmount the given disk"""
-    logger.debug("unmount_disk(): Checking if "+disk+" is mounted...")
+def unmount_disk(disk, already_mounted=False):
+    """
+    Unmount the given disk.
+    If already_mounted is True, the caller has just checked that the disk is
+    mounted, so don't check again before unmounting it.
+    """
+    logger.debug("unmount_disk(): Checking if %s is mounted...", disk)
 
     #Check if it is mounted.
-    if not is_mounted(disk):
+    if not already_mounted and not is_mounted(disk):
         #The disk isn't mounted.
         #Set retval to 0 and log this.
         retval = 0
@@ -833,17 +1320,21 @@ def unmount_disk(disk):
 
     else:
         #The disk is mounted.
-        logger.debug("unmount_disk(): Unmounting "+disk+"...")
+        logger.debug("unmount_disk(): Unmounting %s...", disk)
 
-        #Unmount it.
-        if LINUX:
-            retval = start_process(cmd="umount "+disk, return_output=False, privileged=True)
+        #Unmount it. Uses diskutil on OS X.
+        retval = start_process(cmd=_unmount_cmd(disk), return_output=False, privileged=True)
 
-        else:
-            retval = start_process(cmd="diskutil umount "+disk, return_output=False, privileged=True)
+        #What is mounted has (probably) changed.
+        _invalidate_mount_cache()
 
         #Check that this worked okay.
-        if retval != 0:
+        if retval != 0 and already_mounted and not is_mounted(disk):
+            #It was unmounted by something else since the caller checked.
+            retval = 0
+            logger.info("unmount_disk(): "+disk+" was not mounted. Continuing...")
+
+        elif retval != 0:
             #It didn't, for some strange reason.
             logger.warning("unmount_disk(): Unmounting "+disk+": Failed!")
 
@@ -855,11 +1346,12 @@ def unmount_disk(disk):
 
 def is_partition(disk, disk_info):
     """Check if the given disk is a partition"""
-    logger.debug("is_partition(): Checking if disk: "+disk+" is a partition...")
+    logger.debug("is_partition(): Checking if disk: %s is a partition...", disk)
 
     if LINUX:
-        result = (disk[0:7] not in ["/dev/sr", "/dev/fd"] and disk[-1].isdigit()
-                  and disk[0:8] in disk_info.keys())
+        #Do the cheapest check first, so most non-partitions are ruled out straight away.
+        result = (disk[-1:].isdigit() and not disk.startswith(("/dev/sr", "/dev/fd"))
+                  and disk[0:8] in disk_info)
 
     else:
         result = ("s" in disk.split("disk")[1])
@@ -875,13 +1367,11 @@ def emergency_exit(msg):
     logger.critical("CoreEmergencyExit(): The error is: "+msg)
 
     #Warn the user.
-    dialog = wx.MessageDialog(None, "Emergency exit triggered.\n\n"+msg
-                              +"\n\nYou'll now be asked for a location to save the log file."
-                              +"\nIf you email me at hamishmb@live.co.uk with the contents of "
-                              +"that file I'll be happy to help you fix this problem."
-                              , "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_ERROR)
-    dialog.ShowModal()
-    dialog.Destroy()
+    show_message_dialog(None, "Emergency exit triggered.\n\n"+msg
+                        +"\n\nYou'll now be asked for a location to save the log file."
+                        +"\nIf you email me at hamishmb@live.co.uk with the contents of "
+                        +"that file I'll be happy to help you fix this problem."
+                        , "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_ERROR)
 
     #Shut down the logger.
     logging.shutdown()
@@ -900,18 +1390,14 @@ def emergency_exit(msg):
 
         else:
             #Warn the user.
-            dialog = wx.MessageDialog(None, "Please enter a file name.",
-                                      "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_ERROR)
-            dialog.ShowModal()
-            dialog.Destroy()
+            show_message_dialog(None, "Please enter a file name.",
+                                "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_ERROR)
 
-    start_process("mv -v /tmp/ddrescue-gui.log "+log_file)
+    start_process(["mv", "-v", "/tmp/ddrescue-gui.log", log_file])
 
     #Exit.
-    dialog = wx.MessageDialog(None, "Done. DDRescue-GUI will now exit.",
-                              "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_INFORMATION)
-    dialog.ShowModal()
-    dialog.Destroy()
+    show_message_dialog(None, "Done. DDRescue-GUI will now exit.",
+                        "DDRescue-GUI - Emergency Exit!", wx.OK | wx.ICON_INFORMATION)
 
     wx.Exit()
     sys.exit(msg)